@@ -1,4 +1,6 @@
 import pygame, sys, random, math
+from text_cache import render_text
+from menu_cache import MenuLayer, IdleClock
 
 # --- Initialization ---
 pygame.init()
@@ -6,7 +8,8 @@ info = pygame.display.Info()
 SCREEN_WIDTH, SCREEN_HEIGHT = info.current_w, info.current_h
 screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
 pygame.display.set_caption("Dodge Ball Challenge")
-clock = pygame.time.Clock()
+clock = IdleClock()
+menus = MenuLayer()
 
 # --- Colors ---
 WHITE    = (255, 255, 255)
@@ -31,8 +34,7 @@ ball_speed_multiplier = 1.0
 
 # --- Utility Functions ---
 def draw_text(surf, text, size, color, center):
-    font = pygame.font.SysFont("arial", size)
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(text, size, color, "arial")
     text_rect = text_surface.get_rect(center=center)
     surf.blit(text_surface, text_rect)
 
@@ -159,20 +161,20 @@ def init_game():
     # ball_spawn_interval and ball_speed_multiplier are set during difficulty selection
 
 # --- Menus ---
-def title_screen():
-    screen.fill(DARKGRAY)
-    draw_text(screen, "Dodge Ball Challenge", 60, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+def title_screen(surf):
+    surf.fill(DARKGRAY)
+    draw_text(surf, "Dodge Ball Challenge", 60, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
     play_rect = pygame.Rect(0, 0, 250, 50)
     play_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
     exit_rect = pygame.Rect(0, 0, 250, 50)
     exit_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
-    draw_button(screen, "Play", play_rect, GRAY, WHITE)
-    draw_button(screen, "Exit", exit_rect, GRAY, WHITE)
+    draw_button(surf, "Play", play_rect, GRAY, WHITE)
+    draw_button(surf, "Exit", exit_rect, GRAY, WHITE)
     return play_rect, exit_rect
 
-def difficulty_screen():
-    screen.fill(DARKGRAY)
-    draw_text(screen, "Select Difficulty", 60, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//4))
+def difficulty_screen(surf):
+    surf.fill(DARKGRAY)
+    draw_text(surf, "Select Difficulty", 60, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//4))
     btn_width = 200
     btn_height = 50
     spacing = 20
@@ -184,21 +186,21 @@ def difficulty_screen():
     easy_rect.center = (SCREEN_WIDTH//2, start_y + btn_height//2)
     medium_rect.center = (SCREEN_WIDTH//2, start_y + btn_height + spacing + btn_height//2)
     hard_rect.center = (SCREEN_WIDTH//2, start_y + 2*(btn_height + spacing) + btn_height//2)
-    draw_button(screen, "Easy", easy_rect, GRAY, WHITE)
-    draw_button(screen, "Medium", medium_rect, GRAY, WHITE)
-    draw_button(screen, "Hard", hard_rect, GRAY, WHITE)
+    draw_button(surf, "Easy", easy_rect, GRAY, WHITE)
+    draw_button(surf, "Medium", medium_rect, GRAY, WHITE)
+    draw_button(surf, "Hard", hard_rect, GRAY, WHITE)
     return easy_rect, medium_rect, hard_rect
 
-def game_over_screen():
-    screen.fill(BLACK)
-    draw_text(screen, "Game Over", 60, RED, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
-    draw_text(screen, f"Survived: {int(score)} sec", 40, WHITE, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 60))
+def game_over_screen(surf, survived):
+    surf.fill(BLACK)
+    draw_text(surf, "Game Over", 60, RED, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+    draw_text(surf, f"Survived: {survived} sec", 40, WHITE, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 60))
     retry_rect = pygame.Rect(0, 0, 250, 50)
     title_rect = pygame.Rect(0, 0, 250, 50)
     retry_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
     title_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
-    draw_button(screen, "Retry", retry_rect, GRAY, WHITE)
-    draw_button(screen, "Title", title_rect, GRAY, WHITE)
+    draw_button(surf, "Retry", retry_rect, GRAY, WHITE)
+    draw_button(surf, "Title", title_rect, GRAY, WHITE)
     return retry_rect, title_rect
 
 # --- Main Game Loop ---
@@ -208,10 +210,10 @@ state = "title"  # possible states: title, difficulty, playing, game_over
 init_game()
 
 while running:
-    dt = clock.tick(60) / 1000.0  # delta time in seconds
+    dt = clock.tick(60, idle=state != "playing") / 1000.0  # delta time in seconds
 
     if state == "title":
-        play_button, exit_button = title_screen()
+        play_button, exit_button = menus.show(title_screen)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -223,10 +225,9 @@ while running:
                     state = "difficulty"
                 elif exit_button.collidepoint(event.pos):
                     running = False
-        pygame.display.flip()
 
     elif state == "difficulty":
-        easy_btn, medium_btn, hard_btn = difficulty_screen()
+        easy_btn, medium_btn, hard_btn = menus.show(difficulty_screen)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -245,7 +246,6 @@ while running:
                     ball_speed_multiplier = difficulties[difficulty]["speed_multiplier"]
                     init_game()
                     state = "playing"
-        pygame.display.flip()
 
     elif state == "playing":
         for event in pygame.event.get():
@@ -282,9 +282,10 @@ while running:
             ball.draw(screen)
         draw_text(screen, f"Time: {int(score)} sec", 24, WHITE, (70, 20))
         pygame.display.flip()
+        menus.invalidate()
 
     elif state == "game_over":
-        retry_btn, title_btn = game_over_screen()
+        retry_btn, title_btn = menus.show(game_over_screen, int(score))
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -297,7 +298,6 @@ while running:
                     state = "playing"
                 elif title_btn.collidepoint(event.pos):
                     state = "title"
-        pygame.display.flip()
 
 pygame.quit()
 sys.exit()
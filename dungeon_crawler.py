@@ -1,11 +1,16 @@
-import pygame, sys, random, math
+import pygame, sys, random, math, os
+from collections import deque
+from text_cache import render_text
+from menu_cache import MenuLayer, IdleClock
+from level_file import load_level
 
 # === Initialization ===
 pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Dungeon Crawler Adventure")
-clock = pygame.time.Clock()
+clock = IdleClock()
+menus = MenuLayer()
 
 # === Global Constants & Colors ===
 TILE_SIZE = 40
@@ -30,87 +35,15 @@ game_state = "title"
 score = 0
 current_level = 0  # 0-based: levels 0-4 (Level 5 is boss)
 
-# === Level Maps ===
-# Legend:
-#   W = Wall
-#   . = Floor (unused, simply background)
-#   C = Coin
-#   E = Enemy spawn (regular enemy)
-#   B = Boss spawn (only in Level 5)
-#   P = Player spawn
-#   D = Exit door
-
-level1 = [
-    "WWWWWWWWWWWWWWWWWW",
-    "W......C.........W",
-    "W..WWW.....WWW...W",
-    "W..W...E...W..C..W",
-    "W..W........W....W",
-    "W..W..WWW...W....W",
-    "W....W.PW.......DW",
-    "W..C.W...W...WWW.W",
-    "W......C.W.......W",
-    "WWWWWWWWWWWWWWWWWW"
-]
-
-level2 = [
-    "WWWWWWWWWWWWWWWWWW",
-    "W...C......E.....W",
-    "W..WWW....WWW....W",
-    "W..W...E..W..C...W",
-    "W..W..........E..W",
-    "W..W..WWW...W....W",
-    "W....W.PW....E..DW",
-    "W..C.W...W...WWW.W",
-    "W...E..C.W.......W",
-    "WWWWWWWWWWWWWWWWWW"
-]
-
-level3 = [
-    "WWWWWWWWWWWWWWWWWW",
-    "W.C....E...C.....W",
-    "W..WWW..WWW.WWWW.W",
-    "W..W...E.W..W.C..W",
-    "W..W...WWW..W....W",
-    "W..W..WWW...W.E..W",
-    "W....W.PW...E...DW",
-    "W..C.W...W...WWW.W",
-    "W...E..C.W..E....W",
-    "WWWWWWWWWWWWWWWWWW"
-]
-
-level4 = [
-    "WWWWWWWWWWWWWWWWWW",
-    "W.C.E..E...C.E...W",
-    "W..WWW..WWW.WWWW.W",
-    "W.EW...E.W..W.CE.W",
-    "W..W...WWW..W....W",
-    "W..W..WWW...W.E..W",
-    "W....W.PW...E...DW",
-    "W.C.W...W.E.WWW.EW",
-    "W...E..C.W..E....W",
-    "WWWWWWWWWWWWWWWWWW"
-]
-
-level5 = [
-    "WWWWWWWWWWWWWWWWWW",
-    "W.C..............W",
-    "W..WWW.....WWW...W",
-    "W..W...B...W..C..W",
-    "W..W........W....W",
-    "W..W..WWW...W....W",
-    "W....W.PW.......DW",
-    "W..C.W...W...WWW.W",
-    "W........W.......W",
-    "WWWWWWWWWWWWWWWWWW"
-]
-
-levels = [level1, level2, level3, level4, level5]
+# === Level Files ===
+# Levels live in levels/levelN.txt (see level_file.py for the format) and are
+# compiled to a memory-mapped .lvl cache next to each file on first load.
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")
+levels = [os.path.join(LEVEL_DIR, f"level{number}.txt") for number in range(1, 6)]
 
 # === Utility Functions ===
 def draw_text(surf, text, size, color, center):
-    font = pygame.font.Font(FONT_NAME, size)
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(text, size, color, FONT_NAME)
     text_rect = text_surface.get_rect(center=center)
     surf.blit(text_surface, text_rect)
 
@@ -120,32 +53,236 @@ def draw_button(surf, text, rect, button_color, text_color):
     draw_text(surf, text, 24, text_color, rect.center)
 
 # === Level Parser ===
-def parse_level(map_data):
-    walls = []
-    coins = []
-    enemies = []
-    player_start = None
-    exit_rect = None
-    rows = len(map_data)
-    cols = len(map_data[0])
-    for row in range(rows):
-        for col in range(cols):
+CHUNK_TILES = 8  # levels are parsed and baked in square chunks of this many tiles
+CHUNK_SIZE = CHUNK_TILES * TILE_SIZE
+WALL_TILE = ord("W")
+DOOR_TILE = ord("D")
+
+class WallGrid:
+    """
+    Wall queries answered straight from the level's tile bytes, so collision
+    checks only look at the tiles a rect overlaps and nothing is stored per wall.
+    """
+    def __init__(self, data):
+        self.data = data
+        self.rows = data.rows
+        self.cols = data.cols
+
+    def blocked(self, col, row):
+        """True for wall tiles and anything outside the map."""
+        if col < 0 or row < 0 or col >= self.cols or row >= self.rows:
+            return True
+        return self.data.tiles[row * self.cols + col] == WALL_TILE
+
+    def near(self, rect):
+        """Return the wall rects on the tiles overlapped by rect."""
+        left = max(0, rect.left // TILE_SIZE)
+        right = min(self.cols - 1, (rect.right - 1) // TILE_SIZE)
+        top = max(0, rect.top // TILE_SIZE)
+        bottom = min(self.rows - 1, (rect.bottom - 1) // TILE_SIZE)
+        found = []
+        for row in range(top, bottom + 1):
+            line = self.data.row(row)
+            for col in range(left, right + 1):
+                if line[col] == WALL_TILE:
+                    found.append(pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+        return found
+
+class Level:
+    """
+    A level map streamed in CHUNK_TILES square chunks. A chunk's coins and
+    enemies are spawned the first time the camera comes within one chunk of
+    it, and its tiles are baked into a surface that is dropped again once the
+    camera moves away, so memory follows the viewport rather than the map.
+    The player start, exit door and bosses are read from the compiled level.
+    """
+    def __init__(self, path):
+        self.data = load_level(path, CHUNK_TILES)
+        self.rows = self.data.rows
+        self.cols = self.data.cols
+        self.width = self.cols * TILE_SIZE
+        self.height = self.rows * TILE_SIZE
+        self.chunk_cols = (self.cols + CHUNK_TILES - 1) // CHUNK_TILES
+        self.chunk_rows = (self.rows + CHUNK_TILES - 1) // CHUNK_TILES
+        self.walls = WallGrid(self.data)
+        self.pursuit = PursuitMap(self.walls)
+        self.boss_pursuit = PursuitMap(self.walls, clearance=2)
+        self.coins = []
+        self.enemies = []
+        self.player_start = None
+        self.exit_rect = None
+        self.parsed = set()
+        self.surfaces = {}  # (chunk_col, chunk_row) -> baked tiles near the camera
+        if self.data.player is not None:
+            col, row = self.data.player
+            self.player_start = (col * TILE_SIZE + TILE_SIZE//2 - 15, row * TILE_SIZE + TILE_SIZE//2 - 15)
+        if self.data.door is not None:
+            col, row = self.data.door
+            self.exit_rect = pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        for col, row in self.data.bosses:
+            self.enemies.append(BossEnemy(col * TILE_SIZE + TILE_SIZE//2 - 30, row * TILE_SIZE + TILE_SIZE//2 - 30))
+
+    def close(self):
+        """Releases the memory-mapped level file."""
+        self.data.close()
+
+    def tile_range(self, chunk_col, chunk_row):
+        cols = range(chunk_col * CHUNK_TILES, min(self.cols, (chunk_col + 1) * CHUNK_TILES))
+        rows = range(chunk_row * CHUNK_TILES, min(self.rows, (chunk_row + 1) * CHUNK_TILES))
+        return cols, rows
+
+    def parse_chunk(self, chunk_col, chunk_row):
+        for tile, col, row in self.data.chunk_spawns(chunk_col, chunk_row):
             x = col * TILE_SIZE
             y = row * TILE_SIZE
-            tile = map_data[row][col]
-            if tile == "W":
-                walls.append(pygame.Rect(x, y, TILE_SIZE, TILE_SIZE))
-            elif tile == "C":
-                coins.append(Coin(x + TILE_SIZE//2, y + TILE_SIZE//2))
+            if tile == "C":
+                self.coins.append(Coin(x + TILE_SIZE//2, y + TILE_SIZE//2))
             elif tile == "E":
-                enemies.append(Enemy(x + TILE_SIZE//2 - 15, y + TILE_SIZE//2 - 15))
-            elif tile == "B":
-                enemies.append(BossEnemy(x + TILE_SIZE//2 - 30, y + TILE_SIZE//2 - 30))
-            elif tile == "P":
-                player_start = (x + TILE_SIZE//2 - 15, y + TILE_SIZE//2 - 15)
-            elif tile == "D":
-                exit_rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-    return walls, coins, enemies, player_start, exit_rect
+                self.enemies.append(Enemy(x + TILE_SIZE//2 - 15, y + TILE_SIZE//2 - 15))
+
+    def bake_chunk(self, chunk_col, chunk_row):
+        cols, rows = self.tile_range(chunk_col, chunk_row)
+        surf = pygame.Surface((len(cols) * TILE_SIZE, len(rows) * TILE_SIZE)).convert()
+        surf.fill(DUNGEON_FLOOR)
+        for row in rows:
+            line = self.data.row(row)
+            y = (row - rows.start) * TILE_SIZE
+            for col in cols:
+                x = (col - cols.start) * TILE_SIZE
+                tile = line[col]
+                if tile == WALL_TILE:
+                    pygame.draw.rect(surf, LIGHTGRAY, (x, y, TILE_SIZE, TILE_SIZE))
+                    pygame.draw.rect(surf, DARKGRAY, (x, y, TILE_SIZE, TILE_SIZE), 2)
+                elif tile == DOOR_TILE:
+                    pygame.draw.rect(surf, BROWN, (x, y, TILE_SIZE, TILE_SIZE))
+                    pygame.draw.rect(surf, BLACK, (x+5, y+5, TILE_SIZE-10, TILE_SIZE-10), 2)
+        return surf
+
+    def chunks_in_view(self, camera, margin=0):
+        left = max(0, camera.x // CHUNK_SIZE - margin)
+        right = min(self.chunk_cols - 1, (camera.x + camera.width - 1) // CHUNK_SIZE + margin)
+        top = max(0, camera.y // CHUNK_SIZE - margin)
+        bottom = min(self.chunk_rows - 1, (camera.y + camera.height - 1) // CHUNK_SIZE + margin)
+        return [(cx, cy) for cy in range(top, bottom + 1) for cx in range(left, right + 1)]
+
+    def stream(self, camera):
+        """Parses and bakes the chunks around the camera and drops the rest."""
+        nearby = self.chunks_in_view(camera, margin=1)
+        for key in nearby:
+            if key not in self.parsed:
+                self.parsed.add(key)
+                self.parse_chunk(*key)
+            if key not in self.surfaces:
+                self.surfaces[key] = self.bake_chunk(*key)
+        if len(self.surfaces) > len(nearby):
+            nearby = set(nearby)
+            for key in [key for key in self.surfaces if key not in nearby]:
+                del self.surfaces[key]
+
+    def draw(self, surf, camera):
+        if self.width < camera.width or self.height < camera.height:
+            surf.fill(DUNGEON_FLOOR)
+        for key in self.chunks_in_view(camera):
+            surf.blit(self.surfaces[key], (key[0] * CHUNK_SIZE - camera.x, key[1] * CHUNK_SIZE - camera.y))
+
+class Camera:
+    """Top-left of the view in world pixels, kept centred on a target but inside the map."""
+    def __init__(self, width, height):
+        self.x = 0
+        self.y = 0
+        self.width = width
+        self.height = height
+
+    def follow(self, rect, map_width, map_height):
+        self.x = max(0, min(rect.centerx - self.width // 2, map_width - self.width))
+        self.y = max(0, min(rect.centery - self.height // 2, map_height - self.height))
+
+    def apply(self, rect):
+        return rect.move(-self.x, -self.y)
+
+    def apply_point(self, pos):
+        return (int(pos[0]) - self.x, int(pos[1]) - self.y)
+
+def move_with_walls(body, dx, dy, walls):
+    """Moves body (x, y, rect) by dx/dy one axis at a time, stopping at walls."""
+    # Horizontal movement and collision
+    body.x += dx
+    body.rect.x = int(body.x)
+    for wall in walls.near(body.rect):
+        if body.rect.colliderect(wall):
+            if dx > 0:
+                body.rect.right = wall.left
+            if dx < 0:
+                body.rect.left = wall.right
+            body.x = body.rect.x
+
+    # Vertical movement and collision
+    body.y += dy
+    body.rect.y = int(body.y)
+    for wall in walls.near(body.rect):
+        if body.rect.colliderect(wall):
+            if dy > 0:
+                body.rect.bottom = wall.top
+            if dy < 0:
+                body.rect.top = wall.bottom
+            body.y = body.rect.y
+
+# === Enemy Pursuit ===
+PURSUIT_RADIUS = 24  # tiles around the player covered by the shared path map
+
+class PursuitMap:
+    """
+    Shared shortest paths to the player for every enemy on the level. A
+    breadth-first search outward from the player's tile (limited to
+    PURSUIT_RADIUS tiles, like the streamed chunks) is rerun only when the
+    player enters a new tile; it records for each reached tile the next tile
+    on its path, so an enemy finds its way around walls with one lookup.
+    With clearance 2 a node is the 2x2 block of tiles whose top-left tile it
+    names, so bodies bigger than a tile only get routed through gaps they fit.
+    """
+    def __init__(self, walls, clearance=1):
+        self.walls = walls
+        self.clearance = clearance
+        self.offset = (clearance - 1) * TILE_SIZE // 2
+        self.target = None
+        self.next_step = {}
+
+    def node(self, pos):
+        return ((pos[0] - self.offset) // TILE_SIZE, (pos[1] - self.offset) // TILE_SIZE)
+
+    def blocked(self, col, row):
+        if self.clearance == 1:
+            return self.walls.blocked(col, row)
+        return any(self.walls.blocked(col + dc, row + dr)
+                   for dr in range(self.clearance) for dc in range(self.clearance))
+
+    def update(self, player_pos):
+        target = self.node(player_pos)
+        if target == self.target:
+            return
+        self.target = target
+        next_step = {target: None}
+        queue = deque([target])
+        while queue:
+            node = queue.popleft()
+            col, row = node
+            for dc, dr in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                step = (col + dc, row + dr)
+                if (step in next_step or abs(step[0] - target[0]) > PURSUIT_RADIUS
+                        or abs(step[1] - target[1]) > PURSUIT_RADIUS or self.blocked(*step)):
+                    continue
+                next_step[step] = node
+                queue.append(step)
+        self.next_step = next_step
+
+    def waypoint(self, pos, player_pos):
+        """Where an enemy at pos should head: the centre of its next node, or the player once close or out of range."""
+        self.update(player_pos)
+        step = self.next_step.get(self.node(pos))
+        if step is None:
+            return player_pos
+        return (step[0] * TILE_SIZE + self.offset + TILE_SIZE // 2,
+                step[1] * TILE_SIZE + self.offset + TILE_SIZE // 2)
 
 # === Game Object Classes ===
 
@@ -180,27 +317,7 @@ class Player:
         if dx != 0 or dy != 0:
             self.facing = pygame.math.Vector2(dx, dy).normalize()
 
-        # Horizontal movement and collision
-        self.x += dx
-        self.rect.x = int(self.x)
-        for wall in walls:
-            if self.rect.colliderect(wall):
-                if dx > 0:
-                    self.rect.right = wall.left
-                if dx < 0:
-                    self.rect.left = wall.right
-                self.x = self.rect.x
-
-        # Vertical movement and collision
-        self.y += dy
-        self.rect.y = int(self.y)
-        for wall in walls:
-            if self.rect.colliderect(wall):
-                if dy > 0:
-                    self.rect.bottom = wall.top
-                if dy < 0:
-                    self.rect.top = wall.bottom
-                self.y = self.rect.y
+        move_with_walls(self, dx, dy, walls)
 
     def update(self, dt, walls):
         self.handle_input(dt, walls)
@@ -216,17 +333,18 @@ class Player:
             return True
         return False
 
-    def draw(self, surf):
-        pygame.draw.circle(surf, BLUE, self.rect.center, self.width//2)
+    def draw(self, surf, camera):
+        rect = camera.apply(self.rect)
+        pygame.draw.circle(surf, BLUE, rect.center, self.width//2)
         if self.attacking:
-            end_pos = (self.rect.centerx + int(self.facing.x * 40),
-                       self.rect.centery + int(self.facing.y * 40))
-            pygame.draw.line(surf, GOLD, self.rect.center, end_pos, 4)
+            end_pos = (rect.centerx + int(self.facing.x * 40),
+                       rect.centery + int(self.facing.y * 40))
+            pygame.draw.line(surf, GOLD, rect.center, end_pos, 4)
         bar_width = 40
         bar_height = 6
         health_ratio = self.health / self.max_health
-        bar_x = self.rect.centerx - bar_width // 2
-        bar_y = self.rect.top - 10
+        bar_x = rect.centerx - bar_width // 2
+        bar_y = rect.top - 10
         pygame.draw.rect(surf, RED, (bar_x, bar_y, bar_width, bar_height))
         pygame.draw.rect(surf, GREEN, (bar_x, bar_y, int(bar_width * health_ratio), bar_height))
 
@@ -239,22 +357,21 @@ class Enemy:
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
         self.health = 50
         self.speed = 80
-    def update(self, dt, player):
-        direction = pygame.math.Vector2(player.rect.centerx - self.rect.centerx,
-                                        player.rect.centery - self.rect.centery)
+    def update(self, dt, player, level):
+        target = level.pursuit.waypoint(self.rect.center, player.rect.center)
+        direction = pygame.math.Vector2(target[0] - self.rect.centerx,
+                                        target[1] - self.rect.centery)
         if direction.length() != 0:
             direction = direction.normalize()
-            self.x += direction.x * self.speed * dt
-            self.y += direction.y * self.speed * dt
-            self.rect.x = int(self.x)
-            self.rect.y = int(self.y)
-    def draw(self, surf):
-        pygame.draw.rect(surf, RED, self.rect)
+            move_with_walls(self, direction.x * self.speed * dt, direction.y * self.speed * dt, level.walls)
+    def draw(self, surf, camera):
+        rect = camera.apply(self.rect)
+        pygame.draw.rect(surf, RED, rect)
         bar_width = 30
         bar_height = 4
         health_ratio = self.health / 50
-        bar_x = self.rect.x
-        bar_y = self.rect.y - 8
+        bar_x = rect.x
+        bar_y = rect.y - 8
         pygame.draw.rect(surf, RED, (bar_x, bar_y, bar_width, bar_height))
         pygame.draw.rect(surf, GREEN, (bar_x, bar_y, int(bar_width * health_ratio), bar_height))
 
@@ -267,22 +384,21 @@ class BossEnemy:
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
         self.health = 300
         self.speed = 50
-    def update(self, dt, player):
-        direction = pygame.math.Vector2(player.rect.centerx - self.rect.centerx,
-                                        player.rect.centery - self.rect.centery)
+    def update(self, dt, player, level):
+        target = level.boss_pursuit.waypoint(self.rect.center, player.rect.center)
+        direction = pygame.math.Vector2(target[0] - self.rect.centerx,
+                                        target[1] - self.rect.centery)
         if direction.length() != 0:
             direction = direction.normalize()
-            self.x += direction.x * self.speed * dt
-            self.y += direction.y * self.speed * dt
-            self.rect.x = int(self.x)
-            self.rect.y = int(self.y)
-    def draw(self, surf):
-        pygame.draw.rect(surf, (139,0,0), self.rect)
+            move_with_walls(self, direction.x * self.speed * dt, direction.y * self.speed * dt, level.walls)
+    def draw(self, surf, camera):
+        rect = camera.apply(self.rect)
+        pygame.draw.rect(surf, (139,0,0), rect)
         bar_width = self.width
         bar_height = 6
         health_ratio = self.health / 300
-        bar_x = self.rect.x
-        bar_y = self.rect.y - 10
+        bar_x = rect.x
+        bar_y = rect.y - 10
         pygame.draw.rect(surf, RED, (bar_x, bar_y, bar_width, bar_height))
         pygame.draw.rect(surf, GREEN, (bar_x, bar_y, int(bar_width * health_ratio), bar_height))
 
@@ -293,96 +409,89 @@ class Coin:
         self.radius = 10
         self.rect = pygame.Rect(self.x - self.radius, self.y - self.radius,
                                 self.radius*2, self.radius*2)
-    def draw(self, surf):
-        pygame.draw.circle(surf, GOLD, (int(self.x), int(self.y)), self.radius)
+    def draw(self, surf, camera):
+        pygame.draw.circle(surf, GOLD, camera.apply_point((self.x, self.y)), self.radius)
 
 # === Global Game Variables (set in reset_game) ===
 player = None
-walls = []
+level = None
+walls = None
 coins = []
 enemies = []
 exit_rect = None
+camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT)
 
 def reset_game():
-    global player, walls, coins, enemies, exit_rect, score
+    global player, level, walls, coins, enemies, exit_rect, score
     score = 0
-    current_map = levels[current_level]
-    walls, coins, enemies, player_start, exit_rect = parse_level(current_map)
+    if level is not None:
+        # Unmap the old level first; its file may be recompiled and replaced now.
+        level.close()
+    level = Level(levels[current_level])
+    # coins and enemies alias the level's lists, which grow as chunks stream in.
+    walls, coins, enemies, exit_rect = level.walls, level.coins, level.enemies, level.exit_rect
+    player_start = level.player_start
     if player_start is None:
         player_start = (TILE_SIZE, TILE_SIZE)
     player = Player(*player_start)
+    camera.follow(player.rect, level.width, level.height)
+    level.stream(camera)
 
 # === Menu Screens ===
-def draw_title_screen():
-    screen.fill(DARKGRAY)
-    draw_text(screen, "Dungeon Crawler Adventure", 60, GOLD, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+def draw_title_screen(surf):
+    surf.fill(DARKGRAY)
+    draw_text(surf, "Dungeon Crawler Adventure", 60, GOLD, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
     start_rect = pygame.Rect(0, 0, 250, 50)
     start_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
     exit_rect_menu = pygame.Rect(0, 0, 250, 50)
     exit_rect_menu.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
-    draw_button(screen, "Start Game", start_rect, GRAY, WHITE)
-    draw_button(screen, "Exit", exit_rect_menu, GRAY, WHITE)
+    draw_button(surf, "Start Game", start_rect, GRAY, WHITE)
+    draw_button(surf, "Exit", exit_rect_menu, GRAY, WHITE)
     return start_rect, exit_rect_menu
 
-def draw_level_complete_screen():
-    screen.fill(BLACK)
-    draw_text(screen, f"Level {current_level+1} Complete!", 60, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
-    draw_text(screen, f"Score: {score}", 40, GOLD, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 50))
+def draw_level_complete_screen(surf, level_number, final_score):
+    surf.fill(BLACK)
+    draw_text(surf, f"Level {level_number} Complete!", 60, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+    draw_text(surf, f"Score: {final_score}", 40, GOLD, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 50))
     next_rect = pygame.Rect(0, 0, 250, 50)
     next_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
     title_rect = pygame.Rect(0, 0, 250, 50)
     title_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
-    draw_button(screen, "Next Level", next_rect, GRAY, WHITE)
-    draw_button(screen, "Title", title_rect, GRAY, WHITE)
+    draw_button(surf, "Next Level", next_rect, GRAY, WHITE)
+    draw_button(surf, "Title", title_rect, GRAY, WHITE)
     return next_rect, title_rect
 
-def draw_game_over_screen():
-    screen.fill(BLACK)
-    draw_text(screen, "Game Over", 60, RED, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
-    draw_text(screen, f"Score: {score}", 40, GOLD, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 50))
+def draw_game_over_screen(surf, final_score):
+    surf.fill(BLACK)
+    draw_text(surf, "Game Over", 60, RED, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+    draw_text(surf, f"Score: {final_score}", 40, GOLD, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 50))
     retry_rect = pygame.Rect(0, 0, 250, 50)
     retry_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
     title_rect = pygame.Rect(0, 0, 250, 50)
     title_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
-    draw_button(screen, "Retry", retry_rect, GRAY, WHITE)
-    draw_button(screen, "Title", title_rect, GRAY, WHITE)
+    draw_button(surf, "Retry", retry_rect, GRAY, WHITE)
+    draw_button(surf, "Title", title_rect, GRAY, WHITE)
     return retry_rect, title_rect
 
-def draw_win_screen():
-    screen.fill(BLACK)
-    draw_text(screen, "Congratulations!", 60, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
-    draw_text(screen, "You defeated the boss and completed your adventure!", 40, GOLD, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 50))
-    draw_text(screen, f"Final Score: {score}", 36, WHITE, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 100))
+def draw_win_screen(surf, final_score):
+    surf.fill(BLACK)
+    draw_text(surf, "Congratulations!", 60, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+    draw_text(surf, "You defeated the boss and completed your adventure!", 40, GOLD, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 50))
+    draw_text(surf, f"Final Score: {final_score}", 36, WHITE, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 100))
     title_rect = pygame.Rect(0, 0, 250, 50)
     title_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
-    draw_button(screen, "Title", title_rect, GRAY, WHITE)
+    draw_button(surf, "Title", title_rect, GRAY, WHITE)
     return title_rect
 
-# === Draw the Dungeon Environment ===
-def draw_level(surf):
-    surf.fill(DUNGEON_FLOOR)
-    rows = len(levels[current_level])
-    cols = len(levels[current_level][0])
-    for row in range(rows):
-        for col in range(cols):
-            x = col * TILE_SIZE
-            y = row * TILE_SIZE
-            tile = levels[current_level][row][col]
-            if tile == "W":
-                pygame.draw.rect(surf, LIGHTGRAY, (x, y, TILE_SIZE, TILE_SIZE))
-            elif tile == "D":
-                pygame.draw.rect(surf, BROWN, (x, y, TILE_SIZE, TILE_SIZE))
-                pygame.draw.rect(surf, BLACK, (x+5, y+5, TILE_SIZE-10, TILE_SIZE-10), 2)
-
 # === Main Game Loop ===
 running = True
 reset_game()
 
 while running:
-    dt = clock.tick(60) / 1000.0
+    dt = clock.tick(60, idle=game_state != "playing") / 1000.0
 
     if game_state == "title":
-        start_button, exit_button = draw_title_screen()
+        start_button, exit_button = menus.show(draw_title_screen)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -393,7 +502,6 @@ while running:
                     game_state = "playing"
                 elif exit_button.collidepoint(event.pos):
                     running = False
-        pygame.display.flip()
 
     elif game_state == "playing":
         for event in pygame.event.get():
@@ -415,7 +523,7 @@ while running:
 
         player.update(dt, walls)
         for enemy in enemies:
-            enemy.update(dt, player)
+            enemy.update(dt, player, level)
         for coin in coins[:]:
             if player.rect.colliderect(coin.rect):
                 coins.remove(coin)
@@ -430,26 +538,28 @@ while running:
         # Check for exit door collision to finish level
         if exit_rect and player.rect.colliderect(exit_rect):
             # For levels 1-4, finish immediately.
-            # For Level 5 (boss level), require boss defeated (i.e. enemies list empty).
+            # For Level 5 (boss level), require the boss defeated. Bosses are
+            # spawned with the level, unlike streamed enemies, so count those.
             if current_level < len(levels) - 1:
                 game_state = "level_complete"
             elif current_level == len(levels) - 1:
-                if len(enemies) == 0:
+                if not any(isinstance(enemy, BossEnemy) for enemy in enemies):
                     game_state = "win"
 
-        draw_level(screen)
-        for wall in walls:
-            pygame.draw.rect(screen, DARKGRAY, wall, 2)
+        camera.follow(player.rect, level.width, level.height)
+        level.stream(camera)
+        level.draw(screen, camera)
         for coin in coins:
-            coin.draw(screen)
+            coin.draw(screen, camera)
         for enemy in enemies:
-            enemy.draw(screen)
-        player.draw(screen)
+            enemy.draw(screen, camera)
+        player.draw(screen, camera)
         draw_text(screen, f"Score: {score}", 24, BLACK, (60, 20))
         pygame.display.flip()
+        menus.invalidate()
 
     elif game_state == "level_complete":
-        next_button, title_button = draw_level_complete_screen()
+        next_button, title_button = menus.show(draw_level_complete_screen, current_level + 1, score)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -461,10 +571,9 @@ while running:
                 elif title_button.collidepoint(event.pos):
                     current_level = 0
                     game_state = "title"
-        pygame.display.flip()
 
     elif game_state == "game_over":
-        retry_button, title_button = draw_game_over_screen()
+        retry_button, title_button = menus.show(draw_game_over_screen, score)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -475,10 +584,9 @@ while running:
                 elif title_button.collidepoint(event.pos):
                     current_level = 0
                     game_state = "title"
-        pygame.display.flip()
 
     elif game_state == "win":
-        title_button = draw_win_screen()
+        title_button = menus.show(draw_win_screen, score)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -486,7 +594,6 @@ while running:
                 if title_button.collidepoint(event.pos):
                     current_level = 0
                     game_state = "title"
-        pygame.display.flip()
 
 pygame.quit()
 sys.exit()
@@ -0,0 +1,168 @@
+import math
+
+import numpy as np
+
+# Headless Flappy Bird with the same tuning as flappybird.py, for training
+# many birds at once. Nothing here touches pygame: time advances in fixed
+# steps of dt seconds, one per step() call.
+
+WIDTH, HEIGHT = 800, 600
+BIRD_X = 150
+BIRD_RADIUS = 10
+GRAVITY = 500          # pixels/s^2
+JUMP_IMPULSE = -200    # velocity set by a flap (UP)
+DOWN_IMPULSE = 200     # velocity set by a dive (DOWN)
+PIPE_WIDTH = 80
+PIPE_GAP = 150
+PIPE_SPEED = 200       # pixels/second
+PIPE_INTERVAL = 1.5    # seconds between new pipes
+
+# Actions, one per bird per step.
+NOTHING, FLAP, DIVE = 0, 1, 2
+
+
+class PipeRing:
+    """
+    Live pipes in fixed-size x / gap_y arrays used as a ring buffer. Pipe i
+    (counting every pipe ever added) sits in slot i % capacity; head is the
+    oldest pipe still on screen, scored the first one the bird has not
+    passed yet and tail the next to be added. Pipes only move left at one
+    speed, so they stay in that order and nothing is ever rebuilt.
+    """
+    def __init__(self, width=PIPE_WIDTH, gap=PIPE_GAP, capacity=8):
+        self.width = width
+        self.gap = gap
+        self.x = np.zeros(capacity)
+        self.gap_y = np.zeros(capacity, dtype=np.int64)
+        self.head = self.scored = self.tail = 0
+
+    def __len__(self):
+        return self.tail - self.head
+
+    def __iter__(self):
+        """Yield (x, gap_y) for each live pipe, oldest first."""
+        capacity = len(self.x)
+        for i in range(self.head, self.tail):
+            yield self.x[i % capacity], self.gap_y[i % capacity]
+
+    def add(self, x, gap_y):
+        capacity = len(self.x)
+        if self.tail - self.head == capacity:
+            self.head += 1  # full: recycle the oldest slot
+            self.scored = max(self.scored, self.head)
+        self.x[self.tail % capacity] = x
+        self.gap_y[self.tail % capacity] = gap_y
+        self.tail += 1
+
+    def advance(self, dx):
+        """Moves every pipe dx to the left and drops those that left the screen."""
+        self.x -= dx
+        capacity = len(self.x)
+        while self.head < self.tail and self.x[self.head % capacity] + self.width <= 0:
+            self.head += 1
+        self.scored = max(self.scored, self.head)
+
+    def next_pipe(self):
+        """(x, gap_y) of the first pipe not yet passed, or None."""
+        if self.scored == self.tail:
+            return None
+        i = self.scored % len(self.x)
+        return self.x[i], self.gap_y[i]
+
+    def pass_bird(self, bird_x):
+        """Counts the pipes whose right edge went past bird_x since the last call."""
+        capacity = len(self.x)
+        start = self.scored
+        while self.scored < self.tail and self.x[self.scored % capacity] + self.width < bird_x:
+            self.scored += 1
+        return self.scored - start
+
+    def hit(self, bird_x, y, radius):
+        """
+        True where a ball of the given radius at (bird_x, y) overlaps a pipe.
+        y may be a NumPy array. Only the pipes just passed and next up can
+        reach the bird's column, and each is a single test of y against its gap.
+        """
+        capacity = len(self.x)
+        hit = False
+        for i in range(max(self.head, self.scored - 1), min(self.scored + 1, self.tail)):
+            x = self.x[i % capacity]
+            if x < bird_x + radius and x + self.width > bird_x - radius:
+                gap_y = self.gap_y[i % capacity]
+                hit = hit | (y - radius < gap_y) | (y + radius > gap_y + self.gap)
+        return hit
+
+
+class FlappyBatch:
+    """
+    n birds flying through one shared pipe stream. Bird state lives in NumPy
+    arrays and every step moves, scores and collides all birds at once
+    against the shared PipeRing. Dead birds keep their final state until reset().
+    """
+    def __init__(self, n, seed=None, dt=1 / 60):
+        self.n = n
+        self.dt = dt
+        self.rng = np.random.default_rng(seed)
+        self.y = np.empty(n)
+        self.velocity = np.empty(n)
+        self.alive = np.empty(n, dtype=bool)
+        self.score = np.empty(n, dtype=np.int64)
+        self.steps = np.empty(n, dtype=np.int64)  # steps survived, for fitness
+        self.pipe_steps = max(1, math.ceil(PIPE_INTERVAL / dt))
+        self.reset()
+
+    def reset(self):
+        self.y[:] = HEIGHT // 2
+        self.velocity[:] = 0
+        self.alive[:] = True
+        self.score[:] = 0
+        self.steps[:] = 0
+        self.clock = 0
+        self.pipes = PipeRing()
+
+    def add_pipe(self):
+        gap_y = int(self.rng.integers(100, HEIGHT - 100 - PIPE_GAP, endpoint=True))
+        self.pipes.add(WIDTH, gap_y)
+
+    def observe(self):
+        """(n, 4) float32 inputs per bird: height, velocity, distance to the
+           next pipe and the next gap's centre relative to the bird."""
+        pipe = self.pipes.next_pipe()
+        obs = np.empty((self.n, 4), dtype=np.float32)
+        obs[:, 0] = self.y
+        obs[:, 1] = self.velocity
+        if pipe is None:
+            obs[:, 2] = WIDTH - BIRD_X
+            obs[:, 3] = HEIGHT / 2 - self.y
+        else:
+            obs[:, 2] = pipe[0] - BIRD_X
+            obs[:, 3] = pipe[1] + PIPE_GAP / 2 - self.y
+        return obs
+
+    def step(self, actions=None):
+        """Advances every live bird by dt. actions holds NOTHING/FLAP/DIVE per
+           bird (None flaps nobody). Returns the alive mask."""
+        dt = self.dt
+        alive = self.alive
+        if actions is not None:
+            actions = np.asarray(actions)
+            self.velocity[alive & (actions == FLAP)] = JUMP_IMPULSE
+            self.velocity[alive & (actions == DIVE)] = DOWN_IMPULSE
+        self.velocity[alive] += GRAVITY * dt
+        self.y[alive] += self.velocity[alive] * dt
+        self.steps[alive] += 1
+
+        # The pipe stream is shared, so it advances once for all birds.
+        self.pipes.advance(PIPE_SPEED * dt)
+        passed = self.pipes.pass_bird(BIRD_X)
+        self.clock += 1
+        if self.clock % self.pipe_steps == 0:
+            self.add_pipe()
+        if passed:
+            self.score[alive] += passed
+
+        # Screen edges, then the gap of the pipe at BIRD_X.
+        hit = (self.y - BIRD_RADIUS < 0) | (self.y + BIRD_RADIUS > HEIGHT)
+        hit |= self.pipes.hit(BIRD_X, self.y, BIRD_RADIUS)
+        alive &= ~hit
+        return alive
@@ -1,6 +1,8 @@
 import pygame
 import random
 import sys
+from text_cache import render_text
+from flappy_sim import PipeRing
 
 # Initialize Pygame
 pygame.init()
@@ -28,13 +30,12 @@ pipe_gap = 150                   # vertical gap between top and bottom pipe segm
 pipe_speed = 200                 # speed at which pipes move left (pixels/second)
 pipe_interval = 1500             # time (ms) between new pipes
 last_pipe_time = pygame.time.get_ticks()
-pipes = []                       # each pipe is a dict with keys: 'x' and 'gap_y'
+pipes = PipeRing(pipe_width, pipe_gap)  # live pipes as x / gap_y ring-buffer arrays
 
 def add_pipe():
     """Adds a new pipe with a random gap position."""
     gap_y = random.randint(100, HEIGHT - 100 - pipe_gap)
-    pipe = {'x': WIDTH, 'gap_y': gap_y, 'scored': False}
-    pipes.append(pipe)
+    pipes.add(WIDTH, gap_y)
 
 def check_collision():
     """Check for collisions between the bird and the pipes or screen edges."""
@@ -42,18 +43,9 @@ def check_collision():
     if bird_y - bird_radius < 0 or bird_y + bird_radius > HEIGHT:
         return True
 
-    # Define a rectangle around the bird for collision detection.
-    bird_rect = pygame.Rect(bird_x - bird_radius, bird_y - bird_radius,
-                            bird_radius * 2, bird_radius * 2)
-    for pipe in pipes:
-        # Top pipe rectangle: from the top of the screen down to the gap.
-        top_rect = pygame.Rect(pipe['x'], 0, pipe_width, pipe['gap_y'])
-        # Bottom pipe rectangle: from the bottom of the gap to the bottom of the screen.
-        bottom_rect = pygame.Rect(pipe['x'], pipe['gap_y'] + pipe_gap,
-                                  pipe_width, HEIGHT - (pipe['gap_y'] + pipe_gap))
-        if bird_rect.colliderect(top_rect) or bird_rect.colliderect(bottom_rect):
-            return True
-    return False
+    # Only a pipe overlapping the bird's column can hit it: the bird's box
+    # must then stay inside that pipe's gap.
+    return pipes.hit(bird_x, bird_y, bird_radius)
 
 score = 0
 
@@ -80,12 +72,8 @@ while running:
     bird_y += bird_velocity * dt
 
     # --- Update Pipes ---
-    # Move each pipe to the left.
-    for pipe in pipes:
-        pipe['x'] -= pipe_speed * dt
-
-    # Remove pipes that have moved off screen.
-    pipes = [pipe for pipe in pipes if pipe['x'] + pipe_width > 0]
+    # Move the pipes to the left; pipes that leave the screen are dropped.
+    pipes.advance(pipe_speed * dt)
 
     # Add new pipes at regular intervals.
     current_time = pygame.time.get_ticks()
@@ -93,11 +81,8 @@ while running:
         add_pipe()
         last_pipe_time = current_time
 
-    # Increase score if the bird passes a pipe.
-    for pipe in pipes:
-        if not pipe['scored'] and pipe['x'] + pipe_width < bird_x:
-            score += 1
-            pipe['scored'] = True
+    # Increase score for each pipe the bird has passed.
+    score += pipes.pass_bird(bird_x)
 
     # --- Check for Collisions ---
     if check_collision():
@@ -109,10 +94,10 @@ while running:
     screen.fill((135, 206, 235))
 
     # Draw pipes as outlined rectangles (using lines)
-    for pipe in pipes:
-        top_rect = pygame.Rect(pipe['x'], 0, pipe_width, pipe['gap_y'])
-        bottom_rect = pygame.Rect(pipe['x'], pipe['gap_y'] + pipe_gap,
-                                  pipe_width, HEIGHT - (pipe['gap_y'] + pipe_gap))
+    for pipe_x, gap_y in pipes:
+        top_rect = pygame.Rect(pipe_x, 0, pipe_width, gap_y)
+        bottom_rect = pygame.Rect(pipe_x, gap_y + pipe_gap,
+                                  pipe_width, HEIGHT - (gap_y + pipe_gap))
         pygame.draw.rect(screen, (34, 139, 34), top_rect, 2)
         pygame.draw.rect(screen, (34, 139, 34), bottom_rect, 2)
 
@@ -123,8 +108,7 @@ while running:
     pygame.draw.line(screen, (139, 69, 19), (0, HEIGHT), (WIDTH, HEIGHT), 4)
 
     # Draw the score.
-    font = pygame.font.SysFont(None, 36)
-    score_surface = font.render(f"Score: {score}", True, (0, 0, 0))
+    score_surface = render_text(f"Score: {score}", 36, (0, 0, 0), None)
     screen.blit(score_surface, (10, 10))
 
     # Update the display.
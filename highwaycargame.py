@@ -1,6 +1,8 @@
 import pygame
 import sys
 import random
+from text_cache import render_text
+from menu_cache import IdleClock
 
 # ----- Pygame Setup -----
 pygame.init()
@@ -8,7 +10,7 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Highway Dodge")
-clock = pygame.time.Clock()
+clock = IdleClock()
 
 # ----- Road (Highway) Parameters -----
 # We draw a perspective road as a trapezoid.
@@ -105,7 +107,7 @@ game_over = False
 
 # ----- Main Game Loop -----
 while True:
-    dt = clock.tick(60) / 1000.0  # delta time in seconds
+    dt = clock.tick(60, idle=game_over) / 1000.0  # delta time in seconds
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -225,13 +227,12 @@ while True:
         pygame.draw.rect(screen, (255, 0, 0), obs_rect)
 
     # Draw HUD: speed and score
-    font = pygame.font.SysFont("Arial", 24)
-    hud_text = font.render(f"Speed: {int(player_speed)}  Score: {score}", True, (255, 255, 255))
+    hud_text = render_text(f"Speed: {int(player_speed)}  Score: {score}", 24, (255, 255, 255), "Arial")
     screen.blit(hud_text, (10, 10))
 
     # Game over message
     if game_over:
-        go_text = font.render("GAME OVER! Press R to restart", True, (255, 255, 0))
+        go_text = render_text("GAME OVER! Press R to restart", 24, (255, 255, 0), "Arial")
         go_rect = go_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(go_text, go_rect)
 
@@ -0,0 +1,162 @@
+import array
+import mmap
+import os
+import struct
+
+# Text levels are one row of tiles per line; blank lines and lines starting
+# with '#' are ignored. Legend:
+#   W = Wall          C = Coin           P = Player spawn
+#   . = Floor         E = Enemy spawn    D = Exit door
+#                     B = Boss spawn
+#
+# Each source is compiled to a binary ".lvl" file next to it, rebuilt when
+# the source is newer:
+#   header   magic, version, chunk size, cols, rows, player, door, counts
+#   tiles    cols*rows bytes, row-major; W, D or '.' (spawns become floor)
+#   bosses   boss_count (col, row) uint32 pairs
+#   index    chunk_count+1 uint32 offsets into the spawn table
+#   spawns   (kind, col, row) uint32 triples grouped by chunk, kind is ord(C/E)
+# All values are in native byte order; the cache is never shipped.
+
+MAGIC = b"DLVL"
+VERSION = 1
+HEADER = struct.Struct("=4sHHIIiiiiII")
+SPAWN_KINDS = "CE"
+# Spawn markers are stored in the tables, so the tile layer only keeps terrain.
+_TERRAIN = str.maketrans({tile: "." for tile in SPAWN_KINDS + "BP"})
+
+
+class CompiledLevel:
+    """A compiled level memory-mapped from its .lvl file."""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.views = []  # every memoryview onto the mapping, released by close()
+        try:
+            self.parse(path)
+        except Exception:
+            # A rejected cache is recompiled right away, so it must not stay mapped.
+            self.close()
+            raise
+
+    def view(self, start, end, format="B"):
+        view = self.views[0][start:end]
+        self.views.append(view)
+        if format != "B":
+            view = view.cast(format)
+            self.views.append(view)
+        return view
+
+    def parse(self, path):
+        self.views.append(memoryview(self.mmap))
+        (magic, version, self.chunk_tiles, self.cols, self.rows,
+         player_col, player_row, door_col, door_row,
+         boss_count, chunk_count) = HEADER.unpack_from(self.views[0])
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a compiled level (version {VERSION})")
+        self.player = (player_col, player_row) if player_col >= 0 else None
+        self.door = (door_col, door_row) if door_col >= 0 else None
+        offset = HEADER.size
+        # A truncated cache must fail here, not with an IndexError deep in the slicing.
+        if len(self.mmap) < offset + self.cols * self.rows + boss_count * 8 + (chunk_count + 1) * 4:
+            raise ValueError(f"{path}: truncated compiled level")
+        self.tiles = self.view(offset, offset + self.cols * self.rows)
+        offset += self.cols * self.rows
+        bosses = self.view(offset, offset + boss_count * 8, "I")
+        self.bosses = [(bosses[i], bosses[i + 1]) for i in range(0, len(bosses), 2)]
+        offset += boss_count * 8
+        self.chunk_index = self.view(offset, offset + (chunk_count + 1) * 4, "I")
+        offset += (chunk_count + 1) * 4
+        if len(self.mmap) != offset + self.chunk_index[chunk_count] * 12:
+            raise ValueError(f"{path}: truncated compiled level")
+        self.spawns = self.view(offset, offset + self.chunk_index[chunk_count] * 12, "I")
+        self.chunk_cols = (self.cols + self.chunk_tiles - 1) // self.chunk_tiles
+
+    def close(self):
+        """Unmaps the file. Call before its source is recompiled: a mapped file
+           cannot be replaced on Windows."""
+        for view in reversed(self.views):
+            view.release()
+        self.views.clear()
+        self.mmap.close()
+
+    def row(self, row):
+        """The tile bytes of one row (index it for ord('W'), ord('D'), ...)."""
+        return self.tiles[row * self.cols:(row + 1) * self.cols]
+
+    def chunk_spawns(self, chunk_col, chunk_row):
+        """Yield (kind, col, row) for the coins and enemies placed in a chunk."""
+        chunk = chunk_row * self.chunk_cols + chunk_col
+        spawns = self.spawns
+        for i in range(self.chunk_index[chunk] * 3, self.chunk_index[chunk + 1] * 3, 3):
+            yield chr(spawns[i]), spawns[i + 1], spawns[i + 2]
+
+
+def read_level_text(path):
+    """Return the tile rows of a text level."""
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if not line or line.startswith("#"):
+                continue
+            if rows and len(line) != len(rows[0]):
+                raise ValueError(f"{path}:{number}: row is {len(line)} tiles wide, expected {len(rows[0])}")
+            rows.append(line)
+    if not rows:
+        raise ValueError(f"{path}: level has no rows")
+    return rows
+
+
+def compile_level(source, target, chunk_tiles):
+    """Compiles a text level into the binary format described above."""
+    rows = read_level_text(source)
+    cols = len(rows[0])
+    chunk_cols = (cols + chunk_tiles - 1) // chunk_tiles
+    chunk_rows = (len(rows) + chunk_tiles - 1) // chunk_tiles
+    chunks = [array.array("I") for _ in range(chunk_cols * chunk_rows)]
+    tiles = bytearray()
+    bosses = array.array("I")
+    player = door = (-1, -1)
+    for row, line in enumerate(rows):
+        for col, tile in enumerate(line):
+            if tile in SPAWN_KINDS:
+                chunks[(row // chunk_tiles) * chunk_cols + col // chunk_tiles].extend((ord(tile), col, row))
+            elif tile == "B":
+                bosses.extend((col, row))
+            elif tile == "P":
+                player = (col, row)
+            elif tile == "D":
+                door = (col, row)
+        tiles += line.translate(_TERRAIN).encode("ascii")
+    index = array.array("I", [0])
+    for spawns in chunks:
+        index.append(index[-1] + len(spawns) // 3)
+    header = HEADER.pack(MAGIC, VERSION, chunk_tiles, cols, len(rows), *player, *door,
+                         len(bosses) // 2, len(chunks))
+    temp = target + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(header)
+        f.write(tiles)
+        f.write(bosses.tobytes())
+        f.write(index.tobytes())
+        for spawns in chunks:
+            f.write(spawns.tobytes())
+    os.replace(temp, target)
+
+
+def load_level(source, chunk_tiles):
+    """
+    Return the CompiledLevel for a text level, compiling it first if its
+    .lvl cache is missing, older than the source or built for another chunk size.
+    """
+    target = os.path.splitext(source)[0] + ".lvl"
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source):
+        try:
+            level = CompiledLevel(target)
+        except (ValueError, struct.error):
+            level = None
+        if level is not None and level.chunk_tiles == chunk_tiles:
+            return level
+    compile_level(source, target, chunk_tiles)
+    return CompiledLevel(target)
@@ -0,0 +1,90 @@
+import pygame
+
+
+class MenuLayer:
+    """
+    Pre-rendered static menu screens.
+
+    show(draw, *inputs) renders a menu by calling draw(surface, *inputs) into
+    an off-screen surface, caches it together with whatever draw returned
+    (usually the button rects), and re-renders only when the inputs (score,
+    winner, ...) or the window size change. The display is only touched when
+    what it shows has changed, and then only the differing regions are
+    pushed with pygame.display.update(rects). Call invalidate() after
+    drawing anything else to the display so the next menu is presented again.
+    """
+    def __init__(self):
+        self.cache = {}  # draw function -> (inputs, surface, result)
+        self.presented = None  # (draw, inputs) of the menu now on the display
+        self.presented_surface = None
+
+    def show(self, draw, *inputs):
+        screen = pygame.display.get_surface()
+        entry = self.cache.get(draw)
+        if entry is None or entry[0] != inputs or entry[1].get_size() != screen.get_size():
+            surface = pygame.Surface(screen.get_size()).convert(screen)
+            entry = (inputs, surface, draw(surface, *inputs))
+            self.cache[draw] = entry
+        # A window that was covered or restored needs a full repaint.
+        if pygame.event.peek((pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)):
+            self.invalidate()
+        if self.presented != (draw, inputs):
+            screen.blit(entry[1], (0, 0))
+            if self.presented_surface is not None and self.presented_surface.get_size() == entry[1].get_size():
+                dirty_rects = changed_rects(self.presented_surface, entry[1])
+            else:
+                dirty_rects = [screen.get_rect()]
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+            self.presented = (draw, inputs)
+            self.presented_surface = entry[1]
+        return entry[2]
+
+    def invalidate(self):
+        """Forget what is on the display; the next show() repaints it fully."""
+        self.presented = None
+        self.presented_surface = None
+
+
+def changed_rects(old, new):
+    """Return bounding rects of the pixels that differ between two same-sized surfaces."""
+    # |new - old| per channel, built from two saturating subtractions.
+    diff = new.copy()
+    diff.blit(old, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    reverse = old.copy()
+    reverse.blit(new, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    diff.blit(reverse, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+    mask = pygame.mask.from_threshold(diff, (0, 0, 0, 255), (1, 1, 1, 255))
+    mask.invert()
+    return mask.get_bounding_rects()
+
+
+class IdleClock:
+    """
+    pygame.time.Clock that stops spinning the main loop on static screens.
+
+    tick(framerate) behaves like Clock.tick during gameplay. With idle=True it
+    first blocks in pygame.event.wait() until input arrives (or timeout ms
+    pass, for screens with a countdown) and puts the event back for the
+    loop's own pygame.event.get(). The framerate cap still applies, so a
+    burst of events never runs the loop faster than gameplay. The time spent
+    blocked on a static screen is not carried into the first gameplay frame.
+    """
+    def __init__(self):
+        self.clock = pygame.time.Clock()
+        self.idling = False
+
+    def tick(self, framerate=0, idle=False, timeout=0):
+        if idle:
+            if not pygame.event.peek():
+                event = pygame.event.wait(timeout)
+                if event.type != pygame.NOEVENT:
+                    pygame.event.post(event)
+            self.idling = True
+        elif self.idling:
+            self.clock.tick()
+            self.idling = False
+        return self.clock.tick(framerate)
+
+    def __getattr__(self, name):
+        return getattr(self.clock, name)
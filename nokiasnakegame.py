@@ -1,6 +1,9 @@
 import pygame
-import random
 import sys
+from text_cache import render_text
+from menu_cache import MenuLayer, IdleClock
+from snake_sim import SnakeGame
+from snake_autopilot import Autopilot
 
 # Initialize Pygame
 pygame.init()
@@ -16,7 +19,8 @@ WINDOW_HEIGHT = GRID_HEIGHT * CELL_SIZE
 
 screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 pygame.display.set_caption("Nokia Snake Game")
-clock = pygame.time.Clock()
+clock = IdleClock()
+menus = MenuLayer()
 
 # Colors
 BLACK      = (0, 0, 0)
@@ -33,16 +37,24 @@ game_state = "start"
 MOVE_DELAY = 150
 
 # Global game variables (will be initialized in reset_game)
-snake = []         # list of (x,y) tuples representing snake segments; head is snake[0]
+game = SnakeGame(GRID_WIDTH, GRID_HEIGHT)  # move/grow/food rules, see snake_sim.py
+snake = None       # SnakeBody of (x,y) cells; head is snake.head
 direction = (1, 0) # current movement direction as (dx, dy)
 food = None        # current food position (x, y)
 last_move_time = 0
+redraw_board = True  # the whole board must be repainted (new game, window exposed)
+changed_cells = []   # cells that changed since the board was last presented
+
+# Autopilot: press A while playing to hand the snake over (arrow keys take it
+# back). Started with --autopilot the game runs unattended as an attract mode
+# / soak test, skipping the menus and restarting after every game.
+autopilot = None  # built on first use; False when the grid has no cycle for it
+autopilot_on = False
 
 # --- Helper Functions ---
 def draw_text(surface, text, size, color, center):
     """Draws centered text on a surface."""
-    font = pygame.font.SysFont("Arial", size)
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(text, size, color, "Arial")
     text_rect = text_surface.get_rect(center=center)
     surface.blit(text_surface, text_rect)
 
@@ -50,33 +62,82 @@ def draw_button(surface, text, rect, button_color, text_color):
     """Draws a button (rectangle with text)."""
     pygame.draw.rect(surface, button_color, rect)
     pygame.draw.rect(surface, WHITE, rect, 2)  # border
-    font = pygame.font.SysFont("Arial", 24)
-    text_surface = font.render(text, True, text_color)
+    text_surface = render_text(text, 24, text_color, "Arial")
     text_rect = text_surface.get_rect(center=rect.center)
     surface.blit(text_surface, text_rect)
 
-def get_random_food_position():
-    """Returns a random cell that is not occupied by the snake.
-       Returns None if no cell is available (win condition)."""
-    available = []
-    for x in range(GRID_WIDTH):
-        for y in range(GRID_HEIGHT):
-            if (x, y) not in snake:
-                available.append((x, y))
-    return random.choice(available) if available else None
+def draw_start_screen(surface):
+    """Draws the title and start button."""
+    surface.fill(BLACK)
+    draw_text(surface, "Snake Game", 48, WHITE, (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4))
+    start_button_rect = pygame.Rect(0, 0, 200, 50)
+    start_button_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+    draw_button(surface, "Start", start_button_rect, DARK_GREEN, WHITE)
+
+def draw_end_screen(surface, won):
+    """Draws the game over or win message with Retry/Exit buttons."""
+    surface.fill(BLACK)
+    if won:
+        draw_text(surface, "You Win!", 48, GREEN, (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4))
+    else:
+        draw_text(surface, "Game Over", 48, RED, (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4))
+    retry_button_rect = pygame.Rect(0, 0, 150, 50)
+    retry_button_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+    exit_button_rect = pygame.Rect(0, 0, 150, 50)
+    exit_button_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 70)
+    draw_button(surface, "Retry", retry_button_rect, DARK_GREEN, WHITE)
+    draw_button(surface, "Exit", exit_button_rect, DARK_GREEN, WHITE)
+
+def build_board():
+    """Bakes the empty board (background and grid lines) into a surface."""
+    surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    surface.fill(BLACK)
+    # Optionally, draw grid lines for a retro look.
+    for x in range(0, WINDOW_WIDTH, CELL_SIZE):
+        pygame.draw.line(surface, GRAY, (x, 0), (x, WINDOW_HEIGHT))
+    for y in range(0, WINDOW_HEIGHT, CELL_SIZE):
+        pygame.draw.line(surface, GRAY, (0, y), (WINDOW_WIDTH, y))
+    return surface
+
+def draw_cell(surface, cell):
+    """Repaints one cell from the board plus whatever now occupies it; returns its rect."""
+    rect = pygame.Rect(cell[0] * CELL_SIZE, cell[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+    surface.blit(board, rect, rect)
+    if cell in snake:
+        pygame.draw.rect(surface, GREEN, rect)
+    elif cell == food:
+        pygame.draw.rect(surface, RED, rect)
+    return rect
 
 def reset_game():
     """Resets the game variables to start a new game."""
-    global snake, direction, food, last_move_time, game_state
-    # Start in the middle of the grid; initial snake has 3 segments.
-    start_x = GRID_WIDTH // 2
-    start_y = GRID_HEIGHT // 2
-    snake = [(start_x, start_y), (start_x - 1, start_y), (start_x - 2, start_y)]
-    direction = (1, 0)  # moving to the right
-    food_pos = get_random_food_position()
-    food = food_pos  # may be None if grid is full (won)
+    global snake, direction, food, last_move_time, game_state, redraw_board
+    game.reset()
+    snake = game.snake
+    direction = game.direction
+    food = game.food  # may be None if grid is full (won)
     last_move_time = pygame.time.get_ticks()
-    game_state = "playing"
+    game_state = game.state
+    redraw_board = True
+    if autopilot_on:
+        autopilot.take_over(game)
+
+def enable_autopilot():
+    """Hands the snake to the autopilot. Returns False when the grid has no cycle for it."""
+    global autopilot
+    if autopilot is None:
+        try:
+            autopilot = Autopilot(GRID_WIDTH, GRID_HEIGHT)
+        except ValueError as error:
+            print("Autopilot unavailable:", error)
+            autopilot = False
+    if autopilot is False:
+        return False
+    autopilot.take_over(game)
+    return True
+
+board = build_board()
+attract_mode = "--autopilot" in sys.argv and enable_autopilot()
 
 # --- Main Game Loop ---
 while True:
@@ -84,6 +145,8 @@ while True:
         if event.type == pygame.QUIT:
             pygame.quit()
             sys.exit()
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            redraw_board = True
 
         # --- Menu Event Handling ---
         if game_state == "start":
@@ -110,6 +173,10 @@ while True:
         # --- Playing State Event Handling ---
         elif game_state == "playing":
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_a:
+                    autopilot_on = not autopilot_on and enable_autopilot()
+                elif event.key in (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT):
+                    autopilot_on = False
                 # Update direction based on arrow keys; disallow direct reversal.
                 if event.key == pygame.K_UP and direction != (0, 1):
                     direction = (0, -1)
@@ -121,71 +188,43 @@ while True:
                     direction = (1, 0)
 
     # --- Game Logic ---
+    if attract_mode and game_state != "playing":
+        autopilot_on = True
+        reset_game()
     if game_state == "playing":
         current_time = pygame.time.get_ticks()
         if current_time - last_move_time > MOVE_DELAY:
-            # Compute new head position.
-            new_head = (snake[0][0] + direction[0], snake[0][1] + direction[1])
-            # Check collision with walls.
-            if (new_head[0] < 0 or new_head[0] >= GRID_WIDTH or 
-                new_head[1] < 0 or new_head[1] >= GRID_HEIGHT):
-                game_state = "game_over"
-            # Check collision with self.
-            elif new_head in snake:
-                game_state = "game_over"
-            else:
-                # Move the snake: add the new head.
-                snake.insert(0, new_head)
-                # Check if food is eaten.
-                if new_head == food:
-                    food = get_random_food_position()
-                    # If no food can be placed, the grid is full => win!
-                    if food is None:
-                        game_state = "win"
-                else:
-                    # Remove tail segment.
-                    snake.pop()
+            if autopilot_on:
+                direction = autopilot.choose(game)
+            # Advance the simulation one cell; it reports the cells to repaint.
+            changed_cells.extend(game.step(direction))
+            direction = game.direction
+            food = game.food
+            game_state = game.state
             last_move_time = current_time
 
     # --- Drawing ---
-    screen.fill(BLACK)
-
     if game_state == "start":
-        # Draw the title and start button.
-        draw_text(screen, "Snake Game", 48, WHITE, (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4))
-        start_button_rect = pygame.Rect(0, 0, 200, 50)
-        start_button_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
-        draw_button(screen, "Start", start_button_rect, DARK_GREEN, WHITE)
+        menus.show(draw_start_screen)
 
     elif game_state == "playing":
-        # Optionally, draw grid lines for a retro look.
-        for x in range(0, WINDOW_WIDTH, CELL_SIZE):
-            pygame.draw.line(screen, GRAY, (x, 0), (x, WINDOW_HEIGHT))
-        for y in range(0, WINDOW_HEIGHT, CELL_SIZE):
-            pygame.draw.line(screen, GRAY, (0, y), (WINDOW_WIDTH, y))
-
-        # Draw the snake (each segment as a green cell).
-        for segment in snake:
-            rect = pygame.Rect(segment[0] * CELL_SIZE, segment[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, GREEN, rect)
-
-        # Draw the food (a red cell).
-        if food:
-            food_rect = pygame.Rect(food[0] * CELL_SIZE, food[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, RED, food_rect)
+        # The board persists on screen; only cells touched by a move are repainted.
+        if redraw_board:
+            screen.blit(board, (0, 0))
+            for segment in snake:
+                rect = pygame.Rect(segment[0] * CELL_SIZE, segment[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                pygame.draw.rect(screen, GREEN, rect)
+            if food:
+                food_rect = pygame.Rect(food[0] * CELL_SIZE, food[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                pygame.draw.rect(screen, RED, food_rect)
+            pygame.display.flip()
+            redraw_board = False
+        elif changed_cells:
+            pygame.display.update([draw_cell(screen, cell) for cell in changed_cells])
+        changed_cells.clear()
+        menus.invalidate()
 
     elif game_state in ("game_over", "win"):
-        # Draw game over or win message and show Retry/Exit buttons.
-        if game_state == "game_over":
-            draw_text(screen, "Game Over", 48, RED, (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4))
-        else:
-            draw_text(screen, "You Win!", 48, GREEN, (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4))
-        retry_button_rect = pygame.Rect(0, 0, 150, 50)
-        retry_button_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
-        exit_button_rect = pygame.Rect(0, 0, 150, 50)
-        exit_button_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 70)
-        draw_button(screen, "Retry", retry_button_rect, DARK_GREEN, WHITE)
-        draw_button(screen, "Exit", exit_button_rect, DARK_GREEN, WHITE)
-
-    pygame.display.flip()
-    clock.tick(60)
+        menus.show(draw_end_screen, game_state == "win")
+
+    clock.tick(60, idle=game_state != "playing" and not attract_mode)
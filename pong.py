@@ -1,4 +1,6 @@
 import pygame, sys, random, numpy as np
+from text_cache import render_text
+from menu_cache import MenuLayer, IdleClock
 
 # ============================
 # Initialization & Fullscreen Setup
@@ -11,7 +13,8 @@ SCREEN_HEIGHT = info.current_h
 # Create a fullscreen window:
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
 pygame.display.set_caption("Retro Pong")
-clock = pygame.time.Clock()
+clock = IdleClock()
+menus = MenuLayer()
 
 # ============================
 # Colors & Global Variables
@@ -37,8 +40,7 @@ WIN_SCORE = 10  # Winning score
 # Utility Functions
 # ============================
 def draw_text(surf, text, size, color, center):
-    font = pygame.font.SysFont("arial", size)
-    txt_surface = font.render(text, True, color)
+    txt_surface = render_text(text, size, color, "arial")
     txt_rect = txt_surface.get_rect(center=center)
     surf.blit(txt_surface, txt_rect)
 
@@ -176,23 +178,23 @@ def init_play():
 # ============================
 # Menu Screens
 # ============================
-def title_screen():
-    screen.fill(BLACK)
-    draw_text(screen, "Retro Pong", 80, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+def title_screen(surf):
+    surf.fill(BLACK)
+    draw_text(surf, "Retro Pong", 80, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
     play_bot_rect = pygame.Rect(0, 0, 300, 50)
     play_pvp_rect = pygame.Rect(0, 0, 300, 50)
     exit_rect = pygame.Rect(0, 0, 300, 50)
     play_bot_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
     play_pvp_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
     exit_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 140)
-    draw_button(screen, "Play vs Bot", play_bot_rect, DARKGRAY, WHITE)
-    draw_button(screen, "Play vs Player", play_pvp_rect, DARKGRAY, WHITE)
-    draw_button(screen, "Exit", exit_rect, DARKGRAY, WHITE)
+    draw_button(surf, "Play vs Bot", play_bot_rect, DARKGRAY, WHITE)
+    draw_button(surf, "Play vs Player", play_pvp_rect, DARKGRAY, WHITE)
+    draw_button(surf, "Exit", exit_rect, DARKGRAY, WHITE)
     return play_bot_rect, play_pvp_rect, exit_rect
 
-def difficulty_screen():
-    screen.fill(BLACK)
-    draw_text(screen, "Select Bot Difficulty", 80, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//4))
+def difficulty_screen(surf):
+    surf.fill(BLACK)
+    draw_text(surf, "Select Bot Difficulty", 80, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//4))
     btn_width = 250
     btn_height = 50
     spacing = 20
@@ -206,22 +208,22 @@ def difficulty_screen():
     medium_rect.center = (SCREEN_WIDTH//2, start_y + btn_height + spacing + btn_height//2)
     hard_rect.center = (SCREEN_WIDTH//2, start_y + 2*(btn_height+spacing) + btn_height//2)
     very_rect.center = (SCREEN_WIDTH//2, start_y + 3*(btn_height+spacing) + btn_height//2)
-    draw_button(screen, "Easy", easy_rect, DARKGRAY, WHITE)
-    draw_button(screen, "Medium", medium_rect, DARKGRAY, WHITE)
-    draw_button(screen, "Hard", hard_rect, DARKGRAY, WHITE)
-    draw_button(screen, "Very Hard", very_rect, DARKGRAY, WHITE)
+    draw_button(surf, "Easy", easy_rect, DARKGRAY, WHITE)
+    draw_button(surf, "Medium", medium_rect, DARKGRAY, WHITE)
+    draw_button(surf, "Hard", hard_rect, DARKGRAY, WHITE)
+    draw_button(surf, "Very Hard", very_rect, DARKGRAY, WHITE)
     return easy_rect, medium_rect, hard_rect, very_rect
 
-def win_screen(winner_side):
-    screen.fill(BLACK)
-    draw_text(screen, f"{winner_side} Player Wins!", 80, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
-    draw_text(screen, f"Score: {left_score} - {right_score}", 50, WHITE, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 70))
+def win_screen(surf, winner_side, final_left, final_right):
+    surf.fill(BLACK)
+    draw_text(surf, f"{winner_side} Player Wins!", 80, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+    draw_text(surf, f"Score: {final_left} - {final_right}", 50, WHITE, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 70))
     retry_rect = pygame.Rect(0, 0, 300, 50)
     title_rect = pygame.Rect(0, 0, 300, 50)
     retry_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
     title_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
-    draw_button(screen, "Retry", retry_rect, DARKGRAY, WHITE)
-    draw_button(screen, "Title", title_rect, DARKGRAY, WHITE)
+    draw_button(surf, "Retry", retry_rect, DARKGRAY, WHITE)
+    draw_button(surf, "Title", title_rect, DARKGRAY, WHITE)
     return retry_rect, title_rect
 
 # ============================
@@ -233,10 +235,10 @@ right_score = 0
 
 running = True
 while running:
-    dt = clock.tick(60) / 1000.0  # Delta time in seconds
+    dt = clock.tick(60, idle=state != "playing") / 1000.0  # Delta time in seconds
 
     if state == "title":
-        play_bot_btn, play_pvp_btn, exit_btn = title_screen()
+        play_bot_btn, play_pvp_btn, exit_btn = menus.show(title_screen)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -250,10 +252,9 @@ while running:
                     ball = init_play()
                 elif exit_btn.collidepoint(event.pos):
                     running = False
-        pygame.display.flip()
 
     elif state == "difficulty_select":
-        easy_btn, med_btn, hard_btn, very_btn = difficulty_screen()
+        easy_btn, med_btn, hard_btn, very_btn = menus.show(difficulty_screen)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -278,7 +279,6 @@ while running:
                     bot_reaction = 500  # nearly perfect tracking
                     state = "playing"
                     ball = init_play()
-        pygame.display.flip()
 
     elif state == "playing":
         # Add a Title button in the upper-right corner.
@@ -335,9 +335,10 @@ while running:
         # Draw Title button:
         draw_button(screen, "Title", title_btn_rect, DARKGRAY, WHITE)
         pygame.display.flip()
+        menus.invalidate()
 
     elif state == "game_over":
-        retry_btn, title_btn = win_screen(winner)
+        retry_btn, title_btn = menus.show(win_screen, winner, left_score, right_score)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -349,7 +350,6 @@ while running:
                     state = "playing"
                 elif title_btn.collidepoint(event.pos):
                     state = "title"
-        pygame.display.flip()
 
 pygame.quit()
 sys.exit()
@@ -0,0 +1,237 @@
+import random
+from collections import deque
+
+# Snake autopilot: follows a Hamiltonian cycle over the grid and takes BFS
+# shortcuts that stay ahead of the body in cycle order.
+#
+# Every cell has an index on the cycle. As long as the body occupies only
+# cells between the tail and the head in cycle order, every cell strictly
+# between the head and the tail is free and the head can always continue
+# along the cycle. A shortcut only moves forward into that free stretch, so
+# the invariant holds. Skipped cells become holes behind the head, though,
+# and eating the last free cell ahead while holes remain would run the head
+# into the tail; so a shortcut is only taken while more than half the board
+# stays free ahead of the head.
+#
+# A snake taken over mid-game is usually not laid out along the cycle, and
+# until its body covers consecutive cycle cells none of that holds. So it
+# first re-aligns: once the head can run a whole body length along the cycle
+# (either way round) without meeting a cell still in use, it does, which
+# leaves the body on the cycle. Until then it follows the cycle where the
+# tail stays reachable and otherwise takes a random move that keeps it so;
+# the randomness breaks the loops that plain tail-chasing settles into.
+
+
+def hamiltonian_cycle(width, height):
+    """Return the grid cells in the order of a Hamiltonian cycle.
+       Needs an even width or height (no cycle exists otherwise)."""
+    if height % 2 and width % 2 or min(width, height) < 2:
+        raise ValueError("a Hamiltonian cycle needs an even width or height and at least 2x2 cells")
+    if height % 2:
+        return [(x, y) for y, x in hamiltonian_cycle(height, width)]
+    # Row 0 left to right, then rows 1..height-1 snaking over columns
+    # 1..width-1, then back up column 0.
+    cells = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        columns = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        cells.extend((x, y) for x in columns)
+    cells.extend((0, y) for y in range(height - 1, 0, -1))
+    return cells
+
+
+class Autopilot:
+    """
+    Chooses the next direction for a snake_sim.SnakeGame. The cycle and each
+    cell's index on it are computed once per board size. A shortcut path to
+    the food is planned by BFS only when the food moves (or comes back into
+    reach); each move then just re-checks the next cell of the plan in O(1).
+    """
+    def __init__(self, width, height, seed=None):
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        cycle = hamiltonian_cycle(width, height)
+        # Both directions round the cycle, each with every cell's index on it.
+        self.orientations = [(cells, {cell: i for i, cell in enumerate(cells)})
+                             for cells in (cycle, cycle[::-1])]
+        self.aligning = False
+        self.orient(0)
+
+    def orient(self, direction):
+        """Switch to following the cycle forwards (0) or backwards (1)."""
+        self.direction = direction
+        self.cycle, self.order = self.orientations[direction]
+        self.plan = deque()
+        self.plan_food = None
+
+    def successor(self, cell):
+        return self.cycle[(self.order[cell] + 1) % len(self.cycle)]
+
+    def aligned(self, snake):
+        """True if the body covers consecutive cycle cells from tail to head.
+           The shortcut rule only accounts for holes it leaves itself, so a
+           body taken over has to start without any."""
+        segments = snake.segments
+        return all(self.ahead(segments[i + 1], segments[i]) == 1 for i in range(len(segments) - 1))
+
+    def attach(self, game):
+        """Orients the cycle to the game's snake. Returns False if the body is
+           not laid out along the cycle either way."""
+        for direction in (0, 1):
+            self.orient(direction)
+            if self.aligned(game.snake):
+                self.aligning = False
+                return True
+        return False
+
+    def take_over(self, game):
+        """Takes over the game's snake in any layout, re-aligning it to the
+           cycle first when attach() alone cannot."""
+        if not self.attach(game):
+            self.aligning = True
+
+    def ahead(self, a, b):
+        """How many cycle steps b lies ahead of a."""
+        return (self.order[b] - self.order[a]) % len(self.cycle)
+
+    def safe(self, head, tail, step):
+        """True if moving from head to the adjacent cell step keeps the cycle invariant."""
+        jump = self.ahead(head, step)
+        gap = self.ahead(head, tail)
+        if not 0 < jump < gap:
+            return False
+        return jump == 1 or 2 * (gap - jump) > len(self.cycle) + 1
+
+    def neighbours(self, cell):
+        x, y = cell
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            if 0 <= x + dx < self.width and 0 <= y + dy < self.height:
+                yield (x + dx, y + dy)
+
+    def plan_path(self, head, tail, food):
+        """BFS from head to food over cells that are each further ahead on the
+           cycle than the last and no further than the food, never past the tail."""
+        self.plan.clear()
+        limit = self.ahead(head, food)
+        gap = self.ahead(head, tail)
+        if limit >= gap:
+            # The food sits in a hole behind the head; plan again once the tail has passed it.
+            self.plan_food = None
+            return
+        self.plan_food = food
+        if 2 * (gap - 2) <= len(self.cycle) + 1:
+            return  # too little room ahead for any shortcut to be safe
+        parent = {head: None}
+        queue = deque([head])
+        while queue:
+            cell = queue.popleft()
+            if cell == food:
+                break
+            reach = self.ahead(head, cell)
+            for step in self.neighbours(cell):
+                if step not in parent and reach < self.ahead(head, step) <= limit:
+                    parent[step] = cell
+                    queue.append(step)
+        if food not in parent:
+            return
+        cell = food
+        while cell != head:
+            self.plan.appendleft(cell)
+            cell = parent[cell]
+
+    def body_after(self, game, step):
+        """For the body after the head steps to step, when each of its cells
+           can be entered again (in moves from then on). The game checks
+           collisions before the tail moves, so the cell k segments from the
+           tail frees up for the (k + 2)th move."""
+        body = list(game.snake.segments)
+        if step != game.food:
+            body.pop()
+        body.insert(0, step)
+        return {cell: k + 2 for k, cell in enumerate(reversed(body))}
+
+    def tail_distance(self, game, step):
+        """Moves from step until the head can follow its own tail if it steps
+           there, or None when step is blocked or that never happens. Entering
+           a body cell once it has freed up means following the tail."""
+        if step in game.snake:
+            return None
+        frees_after = self.body_after(game, step)
+        distance = {step: 0}
+        queue = deque([step])
+        while queue:
+            cell = queue.popleft()
+            moves = distance[cell] + 1
+            for near in self.neighbours(cell):
+                if near in distance:
+                    continue
+                if near in frees_after:
+                    if moves >= frees_after[near]:
+                        return moves
+                    continue
+                distance[near] = moves
+                queue.append(near)
+        return None
+
+    def clear_run(self, game, step):
+        """True if, after stepping to step, the head can follow the cycle for
+           a whole body length without meeting a cell still in use."""
+        if step in game.snake:
+            return False
+        frees_after = self.body_after(game, step)
+        cell = step
+        for moves in range(1, len(frees_after)):
+            cell = self.successor(cell)
+            if frees_after.get(cell, 0) > moves:
+                return False
+        return True
+
+    def realign(self, game):
+        """The next cell while aligning (see the module comment)."""
+        head = game.snake.head
+        current = self.direction
+        for direction in (current, 1 - current):
+            self.orient(direction)
+            step = self.successor(head)
+            if self.clear_run(game, step):
+                return step
+        self.orient(current)
+        step = self.successor(head)
+        if self.tail_distance(game, step) is not None:
+            return step
+        free = [near for near in self.neighbours(head) if near not in game.snake]
+        safe = [near for near in free if self.tail_distance(game, near) is not None]
+        # Boxed in away from the tail: stay alive as long as possible anyway.
+        return self.rng.choice(safe or free or [step])
+
+    def choose(self, game):
+        """Return the (dx, dy) direction for the game's next step."""
+        snake = game.snake
+        head = snake.head
+        tail = snake.segments[-1]
+        if self.aligning:
+            if not self.aligned(snake):
+                target = self.realign(game)
+                return (target[0] - head[0], target[1] - head[1])
+            self.aligning = False
+        if game.food is not None and game.food != self.plan_food:
+            self.plan_path(head, tail, game.food)
+        target = None
+        if self.plan:
+            step = self.plan.popleft()
+            if abs(step[0] - head[0]) + abs(step[1] - head[1]) == 1 and self.safe(head, tail, step):
+                target = step
+            else:
+                self.plan.clear()
+        if target is None:
+            # No usable plan: take the safe neighbour that jumps furthest
+            # without passing the food, else the next cell on the cycle.
+            target = self.successor(head)
+            if game.food is not None:
+                limit = self.ahead(head, game.food)
+                best = 1
+                for step in self.neighbours(head):
+                    jump = self.ahead(head, step)
+                    if best < jump <= limit and self.safe(head, tail, step):
+                        target, best = step, jump
+        return (target[0] - head[0], target[1] - head[1])
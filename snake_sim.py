@@ -0,0 +1,223 @@
+import random
+from collections import deque
+
+import numpy as np
+
+# Headless snake rules shared by nokiasnakegame.py, bots and tests. Nothing
+# here touches pygame or the clock: the game decides when to call step().
+
+UP, DOWN, LEFT, RIGHT = (0, -1), (0, 1), (-1, 0), (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+
+class FreeCells:
+    """Every grid cell not covered by the snake, kept in a list with
+       swap-remove plus a cell -> index map, so cells can be taken, given
+       back and sampled at random in O(1)."""
+    def __init__(self, width, height, rng=random):
+        self.cells = [(x, y) for x in range(width) for y in range(height)]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        self.rng = rng
+
+    def __len__(self):
+        return len(self.cells)
+
+    def take(self, cell):
+        i = self.index.pop(cell)
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def give(self, cell):
+        self.index[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def sample(self):
+        """A uniformly random free cell, or None when the grid is full."""
+        return self.rng.choice(self.cells) if self.cells else None
+
+
+class SnakeBody:
+    """Snake segments in a deque (head first) plus a set of the cells they
+       cover, so moving, growing and self-collision checks are all O(1).
+       free tracks the remaining grid cells for food placement."""
+    def __init__(self, cells, width, height, rng=random):
+        self.segments = deque(cells)
+        self.occupied = set(self.segments)
+        self.free = FreeCells(width, height, rng)
+        for cell in self.occupied:
+            self.free.take(cell)
+
+    @property
+    def head(self):
+        return self.segments[0]
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    def __contains__(self, cell):
+        return cell in self.occupied
+
+    def move(self, new_head, grow=False):
+        """Adds new_head at the front and, unless growing, drops the tail.
+           Returns the vacated tail cell (None when growing)."""
+        tail = None
+        if not grow:
+            tail = self.segments.pop()
+            self.occupied.discard(tail)
+            self.free.give(tail)
+        self.segments.appendleft(new_head)
+        self.occupied.add(new_head)
+        self.free.take(new_head)
+        return tail
+
+
+class SnakeGame:
+    """
+    One snake board. step(direction) advances exactly one move: turning
+    straight back is ignored, leaving the grid or hitting the body ends the
+    game ("game_over"), eating grows the snake and places new food, and a
+    full grid ends it as "win".
+    """
+    def __init__(self, width=30, height=20, seed=None):
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        # Start in the middle of the grid; initial snake has 3 segments.
+        start_x = self.width // 2
+        start_y = self.height // 2
+        self.snake = SnakeBody([(start_x, start_y), (start_x - 1, start_y), (start_x - 2, start_y)],
+                               self.width, self.height, self.rng)
+        self.direction = RIGHT
+        self.food = self.snake.free.sample()
+        self.state = "playing" if self.food is not None else "win"
+        self.steps = 0
+
+    @property
+    def score(self):
+        return len(self.snake) - 3
+
+    def step(self, direction=None):
+        """Moves one cell and returns the cells whose contents changed."""
+        if self.state != "playing":
+            return []
+        if direction is not None and (direction[0] != -self.direction[0] or direction[1] != -self.direction[1]):
+            self.direction = direction
+        head = self.snake.head
+        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
+        self.steps += 1
+        if not (0 <= new_head[0] < self.width and 0 <= new_head[1] < self.height) or new_head in self.snake:
+            self.state = "game_over"
+            return []
+        ate = new_head == self.food
+        tail = self.snake.move(new_head, grow=ate)
+        changed = [new_head]
+        if tail is not None:
+            changed.append(tail)
+        if ate:
+            self.food = self.snake.free.sample()
+            # If no food can be placed, the grid is full => win!
+            if self.food is None:
+                self.state = "win"
+            else:
+                changed.append(self.food)
+        return changed
+
+
+# --- Batched boards ---
+PLAYING, GAME_OVER, WIN = 0, 1, 2
+_STEP_X = np.array([d[0] for d in DIRECTIONS])
+_STEP_Y = np.array([d[1] for d in DIRECTIONS])
+_OPPOSITE = np.array([DIRECTIONS.index((-dx, -dy)) for dx, dy in DIRECTIONS])
+
+
+class SnakeBatch:
+    """
+    n independent boards advanced together with NumPy, same rules as
+    SnakeGame. Directions are indices into DIRECTIONS. Each board stores,
+    per cell, the step at which the head last entered it; a cell is body
+    while that is within `length` steps of the board's clock, so moving,
+    growing and freeing the tail are all plain array writes.
+    """
+    def __init__(self, n, width=30, height=20, seed=None):
+        self.n = n
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+        self.entered = np.empty((n, width * height), dtype=np.int64)
+        self.clock = np.zeros(n, dtype=np.int64)
+        self.head_x = np.empty(n, dtype=np.int64)
+        self.head_y = np.empty(n, dtype=np.int64)
+        self.length = np.empty(n, dtype=np.int64)
+        self.direction = np.empty(n, dtype=np.int64)
+        self.food = np.empty(n, dtype=np.int64)
+        self.state = np.empty(n, dtype=np.int8)
+        self.reset()
+
+    @property
+    def score(self):
+        return self.length - 3
+
+    def occupied(self, boards):
+        """Body masks (len(boards), width*height) for the given boards."""
+        return self.entered[boards] > (self.clock[boards] - self.length[boards])[:, None]
+
+    def reset(self, boards=None):
+        boards = np.arange(self.n) if boards is None else np.asarray(boards)
+        start_x = self.width // 2
+        start_y = self.height // 2
+        self.entered[boards] = np.iinfo(np.int64).min // 2
+        self.clock[boards] = 0
+        for i in range(3):
+            self.entered[boards, start_y * self.width + start_x - i] = -i
+        self.head_x[boards] = start_x
+        self.head_y[boards] = start_y
+        self.length[boards] = 3
+        self.direction[boards] = DIRECTIONS.index(RIGHT)
+        self.state[boards] = PLAYING
+        self.place_food(boards)
+
+    def place_food(self, boards):
+        """Puts food on a uniformly random free cell; boards with none left are won."""
+        if len(boards) == 0:
+            return
+        keys = self.rng.random((len(boards), self.width * self.height))
+        keys[self.occupied(boards)] = -1.0
+        self.food[boards] = keys.argmax(axis=1)
+        full = keys.max(axis=1) < 0
+        self.state[boards[full]] = WIN
+
+    def step(self, directions=None):
+        """Advances every board still playing by one move. Returns the state array."""
+        active = np.flatnonzero(self.state == PLAYING)
+        if directions is not None:
+            wanted = np.asarray(directions)[active]
+            turn = wanted != _OPPOSITE[self.direction[active]]
+            self.direction[active[turn]] = wanted[turn]
+        direction = self.direction[active]
+        x = self.head_x[active] + _STEP_X[direction]
+        y = self.head_y[active] + _STEP_Y[direction]
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        cell = np.where(inside, y * self.width + x, 0)
+        clock = self.clock[active]
+        hit_body = self.entered[active, cell] > clock - self.length[active]
+        dead = ~inside | hit_body
+        self.state[active[dead]] = GAME_OVER
+
+        moving = active[~dead]
+        cell = cell[~dead]
+        self.clock[moving] += 1
+        self.entered[moving, cell] = self.clock[moving]
+        self.head_x[moving] = x[~dead]
+        self.head_y[moving] = y[~dead]
+        ate = cell == self.food[moving]
+        self.length[moving[ate]] += 1
+        self.place_food(moving[ate])
+        return self.state
@@ -1,5 +1,8 @@
 import pygame, sys, random, math, io, wave
 import numpy as np
+from spatial_hash import SpatialHash
+from text_cache import render_text
+from menu_cache import MenuLayer, IdleClock
 
 # ---------------------------
 # Initialization & Screen Setup
@@ -10,7 +13,8 @@ SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
 # Fullscreen mode:
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
 pygame.display.set_caption("Old School Space Shooter")
-clock = pygame.time.Clock()
+clock = IdleClock()
+menus = MenuLayer()
 
 # ---------------------------
 # Colors
@@ -32,7 +36,6 @@ PURPLE   = (148, 0, 211)
 game_state = "start"
 score = 0
 boss = None          # Holds BossEnemy when boss battle begins
-enemy_bullets = []   # Bullets fired by enemy ships
 asteroids = []       # Asteroids (obstacles)
 coins = []           # Coins (+50 points)
 healthpacks = []     # Health packs (heal the player)
@@ -46,8 +49,7 @@ rest_timer = 5.0          # 5 seconds of resting before boss battle
 # Utility Functions
 # ---------------------------
 def draw_text(surface, text, size, color, center):
-    font = pygame.font.SysFont("Arial", size)
-    txt_surface = font.render(text, True, color)
+    txt_surface = render_text(text, size, color, "Arial")
     txt_rect = txt_surface.get_rect(center=center)
     surface.blit(txt_surface, txt_rect)
 
@@ -100,20 +102,49 @@ pygame.mixer.music.play(-1)
 # Explosion Animation Class
 # ---------------------------
 class Explosion:
-    def __init__(self, x, y):
+    __slots__ = ("x", "y", "timer")
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+        self.timer = 0
+    def spawn(self, x, y):
         self.x = x
         self.y = y
-        self.timer = 0.5  # lasts 0.5 sec
-        self.max_radius = 40
+        self.timer = EXPLOSION_DURATION
     def update(self, dt):
         self.timer -= dt
+    def finished(self):
+        return self.timer <= 0
     def draw(self, surface):
         if self.timer > 0:
-            radius = int(self.max_radius * (1 - self.timer / 0.5))
-            alpha = int(255 * (self.timer / 0.5))
-            s = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (255, 165, 0, alpha), (radius, radius), radius)
-            surface.blit(s, (self.x - radius, self.y - radius))
+            # Pick the pre-rendered frame for how far the explosion has progressed.
+            index = int((1 - self.timer / EXPLOSION_DURATION) * EXPLOSION_FRAME_COUNT)
+            frame = explosion_frames[min(index, EXPLOSION_FRAME_COUNT - 1)]
+            if frame is not None:
+                sprite, radius = frame
+                surface.blit(sprite, (self.x - radius, self.y - radius))
+
+# The explosion animation (growing, fading circle over its 0.5 sec life) is
+# rendered once into EXPLOSION_FRAME_COUNT frames, so drawing never allocates.
+EXPLOSION_FRAME_COUNT = 30
+EXPLOSION_RADIUS = 40
+EXPLOSION_DURATION = 0.5  # seconds
+
+def build_explosion_frames(max_radius, duration):
+    frames = []
+    for i in range(EXPLOSION_FRAME_COUNT):
+        timer = duration * (1 - i / EXPLOSION_FRAME_COUNT)
+        radius = int(max_radius * (1 - timer / duration))
+        alpha = int(255 * (timer / duration))
+        if radius <= 0:
+            frames.append(None)
+            continue
+        s = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        pygame.draw.circle(s, (255, 165, 0, alpha), (radius, radius), radius)
+        frames.append((s, radius))
+    return frames
+
+explosion_frames = build_explosion_frames(EXPLOSION_RADIUS, EXPLOSION_DURATION)
 
 # ---------------------------
 # Starfield for Background
@@ -162,8 +193,8 @@ class Player:
         self.fire_timer -= dt
         if self.fire_timer <= 0:
             self.fire_timer = self.bullet_cooldown
-            bullets.append(Bullet(self.x, self.y - self.size))
-            pew_sound.play()
+            if bullet_pool.spawn(self.x, self.y - self.size) is not None:
+                pew_sound.play()
     def draw(self, surface):
         point1 = (int(self.x), int(self.y - self.size))
         point2 = (int(self.x - self.size), int(self.y + self.size))
@@ -181,11 +212,15 @@ class Player:
 # Bullet Class (Player)
 # ---------------------------
 class Bullet:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+    __slots__ = ("x", "y", "radius", "speed")
+    def __init__(self):
+        self.x = 0
+        self.y = 0
         self.radius = 4
         self.speed = 400
+    def spawn(self, x, y):
+        self.x = x
+        self.y = y
     def update(self, dt):
         self.y -= self.speed * dt
     def draw(self, surface):
@@ -197,11 +232,17 @@ class Bullet:
 # Enemy Bullet Class (Fired by Enemies)
 # ---------------------------
 class EnemyBullet:
-    def __init__(self, x, y, target):
-        self.x = x
-        self.y = y
+    __slots__ = ("x", "y", "radius", "speed", "vx", "vy")
+    def __init__(self):
+        self.x = 0
+        self.y = 0
         self.radius = 4
         self.speed = 400
+        self.vx = 0
+        self.vy = 0
+    def spawn(self, x, y, target):
+        self.x = x
+        self.y = y
         dx = target.x - x
         dy = target.y - y
         dist = math.hypot(dx, dy)
@@ -242,7 +283,7 @@ class Enemy:
         self.fire_timer -= dt
         if self.fire_timer <= 0:
             self.fire_timer = self.fire_cooldown
-            enemy_bullets.append(EnemyBullet(self.x, self.y, player))
+            enemy_bullet_pool.spawn(self.x, self.y, player)
     def draw(self, surface):
         point1 = (int(self.x), int(self.y + self.size))
         point2 = (int(self.x - self.size), int(self.y - self.size))
@@ -276,7 +317,7 @@ class BossEnemy:
         self.fire_timer -= dt
         if self.fire_timer <= 0:
             self.fire_timer = self.fire_cooldown
-            enemy_bullets.append(EnemyBullet(self.x, self.y, player))
+            enemy_bullet_pool.spawn(self.x, self.y, player)
     def draw(self, surface):
         point1 = (int(self.x), int(self.y + self.size))
         point2 = (int(self.x - self.size), int(self.y - self.size))
@@ -344,17 +385,66 @@ class HealthPack:
     def off_screen(self):
         return self.y - self.size > SCREEN_HEIGHT
 
+# ---------------------------
+# Object Pool (Projectiles & Explosions)
+# ---------------------------
+class ObjectPool:
+    """
+    Fixed-capacity pool: every object is allocated up front and recycled
+    through a free list. `active` is the live list the game loop iterates;
+    it is filtered in place rather than rebuilt every frame.
+    """
+    def __init__(self, factory, capacity):
+        self.capacity = capacity
+        self.free = [factory() for _ in range(capacity)]
+        self.active = []
+        self.high_water = 0  # most objects ever in use at once
+    def spawn(self, *args):
+        """Take an object from the free list and spawn it, or return None if the pool is exhausted."""
+        if not self.free:
+            return None
+        obj = self.free.pop()
+        obj.spawn(*args)
+        self.active.append(obj)
+        if len(self.active) > self.high_water:
+            self.high_water = len(self.active)
+        return obj
+    def release_if(self, predicate):
+        """Return every active object for which predicate(obj) is true to the free list."""
+        active = self.active
+        keep = 0
+        for obj in active:
+            if predicate(obj):
+                self.free.append(obj)
+            else:
+                active[keep] = obj
+                keep += 1
+        del active[keep:]
+    def release_all(self):
+        self.free.extend(self.active)
+        self.active.clear()
+
+bullet_pool = ObjectPool(Bullet, 256)
+enemy_bullet_pool = ObjectPool(EnemyBullet, 1024)
+explosion_pool = ObjectPool(Explosion, 128)
+
+def pool_stats():
+    """Return {pool name: (in use, high-water mark, capacity)} for every object pool."""
+    pools = {"bullets": bullet_pool, "enemy_bullets": enemy_bullet_pool, "explosions": explosion_pool}
+    return {name: (len(pool.active), pool.high_water, pool.capacity) for name, pool in pools.items()}
+
 # ---------------------------
 # Global Game Objects & Initialization
 # ---------------------------
 player = Player()
-bullets = []
-enemy_bullets = []
+# The projectile and explosion lists are the pools' live lists; never rebind them.
+bullets = bullet_pool.active
+enemy_bullets = enemy_bullet_pool.active
 enemies = []
 asteroids = []
 coins = []
 healthpacks = []
-explosions = []
+explosions = explosion_pool.active
 stars = [Star() for _ in range(50)]
 enemy_spawn_timer = 0
 asteroid_spawn_timer = 0
@@ -362,29 +452,36 @@ coin_spawn_timer = 0
 healthpack_spawn_timer = 0
 boss = None
 
+# Spatial hash rebuilt every frame for collision checks. Reach values are the
+# largest centre distance at which each kind of pair can still collide.
+collision_grid = SpatialHash(cell_size=64)
+ENEMY_REACH = 20 + 4       # enemy size + bullet radius
+ASTEROID_REACH = 40 / 2 + 4  # largest asteroid half-size + bullet radius
+PLAYER_REACH = 20 + 40 / 2   # player size + largest pickup/asteroid half-size
+
 # ---------------------------
 # Title Screen Function
 # ---------------------------
-def draw_title_screen():
-    screen.fill(DARKBLUE)
+def draw_title_screen(surface):
+    surface.fill(DARKBLUE)
     for star in stars:
-        star.draw(screen)
-    draw_text(screen, "Space Shooter", 60, WHITE, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+        star.draw(surface)
+    draw_text(surface, "Space Shooter", 60, WHITE, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
     start_rect = pygame.Rect(0, 0, 200, 50)
     start_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
     exit_rect = pygame.Rect(0, 0, 200, 50)
     exit_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
-    draw_button(screen, "Start", start_rect, GRAY, WHITE)
-    draw_button(screen, "Exit", exit_rect, GRAY, WHITE)
+    draw_button(surface, "Start", start_rect, GRAY, WHITE)
+    draw_button(surface, "Exit", exit_rect, GRAY, WHITE)
     return start_rect, exit_rect
 
 # ---------------------------
 # Instructions Screen (Brief text about game and controls)
 # ---------------------------
-def draw_instructions_screen():
-    screen.fill(DARKBLUE)
+def draw_instructions_screen(surface):
+    surface.fill(DARKBLUE)
     for star in stars:
-        star.draw(screen)
+        star.draw(surface)
     instructions = [
         "Welcome to Space Shooter!",
         "Use the Arrow Keys to move your spaceship.",
@@ -396,67 +493,65 @@ def draw_instructions_screen():
     ]
     y_offset = SCREEN_HEIGHT//4
     for line in instructions:
-        draw_text(screen, line, 28, WHITE, (SCREEN_WIDTH//2, y_offset))
+        draw_text(surface, line, 28, WHITE, (SCREEN_WIDTH//2, y_offset))
         y_offset += 40
-    draw_text(screen, "Press any key to continue...", 24, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT - 80))
-    pygame.display.flip()
+    draw_text(surface, "Press any key to continue...", 24, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT - 80))
 
 # ---------------------------
 # Game Over Screen Function
 # ---------------------------
-def draw_game_over_screen():
-    screen.fill(DARKBLUE)
-    draw_text(screen, "Game Over", 60, RED, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
-    draw_text(screen, f"Score: {int(score)}", 40, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 50))
+def draw_game_over_screen(surface, final_score):
+    surface.fill(DARKBLUE)
+    draw_text(surface, "Game Over", 60, RED, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+    draw_text(surface, f"Score: {final_score}", 40, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 50))
     retry_rect = pygame.Rect(0, 0, 200, 50)
     retry_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
     title_rect = pygame.Rect(0, 0, 200, 50)
     title_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
-    draw_button(screen, "Retry", retry_rect, GRAY, WHITE)
-    draw_button(screen, "Title", title_rect, GRAY, WHITE)
+    draw_button(surface, "Retry", retry_rect, GRAY, WHITE)
+    draw_button(surface, "Title", title_rect, GRAY, WHITE)
     return retry_rect, title_rect
 
 # ---------------------------
 # Boss Victory Screen Function
 # ---------------------------
-def draw_boss_victory_screen():
-    screen.fill(DARKBLUE)
-    draw_text(screen, "Congratulations!", 60, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
-    draw_text(screen, "You defeated the Boss!", 40, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 50))
+def draw_boss_victory_screen(surface):
+    surface.fill(DARKBLUE)
+    draw_text(surface, "Congratulations!", 60, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3))
+    draw_text(surface, "You defeated the Boss!", 40, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//3 + 50))
     cont_rect = pygame.Rect(0, 0, 250, 50)
     title_rect = pygame.Rect(0, 0, 250, 50)
     cont_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
     title_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70)
-    draw_button(screen, "Free Battle", cont_rect, GRAY, WHITE)
-    draw_button(screen, "Title", title_rect, GRAY, WHITE)
+    draw_button(surface, "Free Battle", cont_rect, GRAY, WHITE)
+    draw_button(surface, "Title", title_rect, GRAY, WHITE)
     return cont_rect, title_rect
 
 # ---------------------------
 # Rest State Screen (Before Boss Battle)
 # ---------------------------
-def draw_rest_screen():
-    screen.fill(DARKBLUE)
+def draw_rest_screen(surface):
+    surface.fill(DARKBLUE)
     for star in stars:
-        star.draw(screen)
+        star.draw(surface)
     message = "Prepare for Boss Battle! Rest now and collect extra Health Packs!"
-    draw_text(screen, message, 36, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 40))
-    draw_text(screen, "You have been awarded bonus Health Packs!", 28, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-    draw_text(screen, "Rest for a few seconds...", 28, WHITE, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40))
-    pygame.display.flip()
+    draw_text(surface, message, 36, YELLOW, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 40))
+    draw_text(surface, "You have been awarded bonus Health Packs!", 28, GREEN, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
+    draw_text(surface, "Rest for a few seconds...", 28, WHITE, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40))
 
 # ---------------------------
 # Reset Game Function
 # ---------------------------
 def reset_game():
-    global player, bullets, enemy_bullets, enemies, asteroids, coins, healthpacks, explosions, enemy_spawn_timer, asteroid_spawn_timer, coin_spawn_timer, healthpack_spawn_timer, score, boss
+    global player, enemies, asteroids, coins, healthpacks, enemy_spawn_timer, asteroid_spawn_timer, coin_spawn_timer, healthpack_spawn_timer, score, boss
     player = Player()
-    bullets = []
-    enemy_bullets = []
+    bullet_pool.release_all()
+    enemy_bullet_pool.release_all()
     enemies = []
     asteroids = []
     coins = []
     healthpacks = []
-    explosions = []
+    explosion_pool.release_all()
     enemy_spawn_timer = 0
     asteroid_spawn_timer = 0
     coin_spawn_timer = 0
@@ -473,10 +568,13 @@ rest_timer = 5.0         # 5 seconds rest period
 running = True
 # We'll use an additional state "instructions" to show game instructions after the title screen.
 while running:
-    dt = clock.tick(60) / 1000.0  # delta time in seconds
+    # Static screens sleep until input; the timed ones also wake when their countdown runs out.
+    countdown = {"instructions": instructions_timer, "rest": rest_timer}.get(game_state)
+    timeout = max(1, math.ceil(countdown * 1000)) if countdown is not None else 0
+    dt = clock.tick(60, idle=game_state != "playing", timeout=timeout) / 1000.0  # delta time in seconds
 
     if game_state == "start":
-        start_button, exit_button = draw_title_screen()
+        start_button, exit_button = menus.show(draw_title_screen)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -491,11 +589,10 @@ while running:
                     pygame.mixer.music.stop()
                 elif exit_button.collidepoint(event.pos):
                     running = False
-        pygame.display.flip()
 
     elif game_state == "instructions":
         # Display instructions about the game.
-        draw_instructions_screen()
+        menus.show(draw_instructions_screen)
         instructions_timer -= dt
         for event in pygame.event.get():
             if event.type == pygame.KEYDOWN:
@@ -524,11 +621,11 @@ while running:
         # Update player's bullets
         for bullet in bullets:
             bullet.update(dt)
-        bullets = [b for b in bullets if not b.off_screen()]
+        bullet_pool.release_if(Bullet.off_screen)
         # Update enemy bullets
         for eb in enemy_bullets:
             eb.update(dt)
-        enemy_bullets = [eb for eb in enemy_bullets if not eb.off_screen()]
+        enemy_bullet_pool.release_if(EnemyBullet.off_screen)
         # Update asteroids
         asteroid_spawn_timer -= dt
         if asteroid_spawn_timer <= 0:
@@ -580,98 +677,129 @@ while running:
         # ---------------------------
         # Collision Checks
         # ---------------------------
-        # Player Bullets with Regular Enemies
-        for bullet in bullets[:]:
-            for enemy in enemies[:]:
+        # Bucket everything into the spatial hash so each check only looks at nearby objects.
+        collision_grid.clear()
+        collision_grid.insert_all("bullets", bullets)
+        collision_grid.insert_all("enemies", enemies)
+        collision_grid.insert_all("asteroids", asteroids)
+        collision_grid.insert_all("coins", coins)
+        collision_grid.insert_all("healthpacks", healthpacks)
+        collision_grid.insert_all("enemy_bullets", enemy_bullets)
+        # Objects to drop are collected here and removed in one pass afterwards.
+        spent_bullets = set()
+        destroyed_enemies = set()
+        destroyed_asteroids = set()
+        # Player Bullets with Regular Enemies and Asteroids
+        for bullet in bullets:
+            for enemy in collision_grid.query("enemies", bullet.x, bullet.y, ENEMY_REACH):
+                if enemy in destroyed_enemies:
+                    continue
                 dist = math.hypot(bullet.x - enemy.x, bullet.y - enemy.y)
                 if dist < enemy.size:
-                    if bullet in bullets:
-                        bullets.remove(bullet)
+                    spent_bullets.add(bullet)
                     enemy.health -= 1
                     if enemy.health <= 0:
-                        explosions.append(Explosion(enemy.x, enemy.y))
+                        explosion_pool.spawn(enemy.x, enemy.y)
                         explosion_sound.play()
-                        if enemy in enemies:
-                            enemies.remove(enemy)
+                        destroyed_enemies.add(enemy)
                         score += 50
                     break
-            # Player Bullets with Boss
-            if boss is not None:
+            if bullet in spent_bullets:
+                continue
+            for asteroid in collision_grid.query("asteroids", bullet.x, bullet.y, ASTEROID_REACH):
+                if asteroid in destroyed_asteroids:
+                    continue
+                dist = math.hypot(bullet.x - asteroid.x, bullet.y - asteroid.y)
+                if dist < asteroid.size/2 + bullet.radius:
+                    spent_bullets.add(bullet)
+                    explosion_pool.spawn(asteroid.x, asteroid.y)
+                    explosion_sound.play()
+                    destroyed_asteroids.add(asteroid)
+                    score += 50
+                    break
+        # Player Bullets with Boss
+        if boss is not None:
+            for bullet in collision_grid.query("bullets", boss.x, boss.y, boss.size):
+                if bullet in spent_bullets:
+                    continue
                 dist = math.hypot(bullet.x - boss.x, bullet.y - boss.y)
                 if dist < boss.size:
-                    if bullet in bullets:
-                        bullets.remove(bullet)
+                    spent_bullets.add(bullet)
                     boss.health -= 1
                     if boss.health <= 0:
-                        explosions.append(Explosion(boss.x, boss.y))
+                        explosion_pool.spawn(boss.x, boss.y)
                         explosion_sound.play()
                         boss = None
                         game_state = "boss_victory"
-                    break
-            # Player Bullets with Asteroids
-            for asteroid in asteroids[:]:
-                dist = math.hypot(bullet.x - asteroid.x, bullet.y - asteroid.y)
-                if dist < asteroid.size/2 + bullet.radius:
-                    if bullet in bullets:
-                        bullets.remove(bullet)
-                    explosions.append(Explosion(asteroid.x, asteroid.y))
-                    explosion_sound.play()
-                    if asteroid in asteroids:
-                        asteroids.remove(asteroid)
-                    score += 50
-                    break
+                        break
         # Player collecting Coins
-        for coin in coins[:]:
+        collected_coins = set()
+        for coin in collision_grid.query("coins", player.x, player.y, PLAYER_REACH):
             dist = math.hypot(player.x - coin.x, player.y - coin.y)
             if dist < player.size + coin.radius:
-                coins.remove(coin)
+                collected_coins.add(coin)
                 score += 50
         # Player collecting Health Packs (heal 50% of max health)
-        for hp in healthpacks[:]:
+        collected_healthpacks = set()
+        for hp in collision_grid.query("healthpacks", player.x, player.y, PLAYER_REACH):
             dist = math.hypot(player.x - hp.x, player.y - hp.y)
             if dist < player.size + hp.size/2:
                 heal_amount = player.max_health * 0.50
                 player.health = min(player.max_health, player.health + heal_amount)
-                healthpacks.remove(hp)
+                collected_healthpacks.add(hp)
         # Enemy Bullets with Player
-        for eb in enemy_bullets[:]:
+        spent_enemy_bullets = set()
+        for eb in collision_grid.query("enemy_bullets", player.x, player.y, PLAYER_REACH):
             dist = math.hypot(player.x - eb.x, player.y - eb.y)
             if dist < player.size + eb.radius:
                 player.health -= player.max_health * 0.10
-                if eb in enemy_bullets:
-                    enemy_bullets.remove(eb)
+                spent_enemy_bullets.add(eb)
                 if player.health <= 0:
                     game_state = "game_over"
         # Regular Enemy collision with Player
-        for enemy in enemies[:]:
+        for enemy in collision_grid.query("enemies", player.x, player.y, player.size + ENEMY_REACH):
+            if enemy in destroyed_enemies:
+                continue
             dist = math.hypot(player.x - enemy.x, player.y - enemy.y)
             if dist < player.size + enemy.size:
                 player.health -= player.max_health * 0.25
-                explosions.append(Explosion(enemy.x, enemy.y))
+                explosion_pool.spawn(enemy.x, enemy.y)
                 explosion_sound.play()
-                if enemy in enemies:
-                    enemies.remove(enemy)
+                destroyed_enemies.add(enemy)
                 if player.health <= 0:
                     game_state = "game_over"
         # Asteroid collision with Player
-        for asteroid in asteroids[:]:
+        player_rect = pygame.Rect(player.x - player.size, player.y - player.size, player.size*2, player.size*2)
+        for asteroid in collision_grid.query("asteroids", player.x, player.y, PLAYER_REACH):
+            if asteroid in destroyed_asteroids:
+                continue
             rect = pygame.Rect(asteroid.x - asteroid.size/2, asteroid.y - asteroid.size/2, asteroid.size, asteroid.size)
-            player_rect = pygame.Rect(player.x - player.size, player.y - player.size, player.size*2, player.size*2)
             if rect.colliderect(player_rect):
                 player.health -= player.max_health * 0.15
-                explosions.append(Explosion(asteroid.x, asteroid.y))
+                explosion_pool.spawn(asteroid.x, asteroid.y)
                 explosion_sound.play()
-                if asteroid in asteroids:
-                    asteroids.remove(asteroid)
+                destroyed_asteroids.add(asteroid)
                 if player.health <= 0:
                     game_state = "game_over"
+        # Drop everything that was hit, destroyed or collected in one pass per list.
+        if spent_bullets:
+            bullet_pool.release_if(spent_bullets.__contains__)
+        if destroyed_enemies:
+            enemies = [e for e in enemies if e not in destroyed_enemies]
+        if destroyed_asteroids:
+            asteroids = [a for a in asteroids if a not in destroyed_asteroids]
+        if collected_coins:
+            coins = [c for c in coins if c not in collected_coins]
+        if collected_healthpacks:
+            healthpacks = [hp for hp in healthpacks if hp not in collected_healthpacks]
+        if spent_enemy_bullets:
+            enemy_bullet_pool.release_if(spent_enemy_bullets.__contains__)
         # Increase score over time
         score += dt * 5
         # Update explosions
-        for exp in explosions[:]:
+        for exp in explosions:
             exp.update(dt)
-            if exp.timer <= 0:
-                explosions.remove(exp)
+        explosion_pool.release_if(Explosion.finished)
         # ---------------------------
         # Drawing
         # ---------------------------
@@ -702,26 +830,31 @@ while running:
         if score >= 3900 and boss is None:
             draw_text(screen, "Boss Incoming Soon! Rest and collect extra Health Packs!", 40, YELLOW, (SCREEN_WIDTH//2, 80))
         pygame.display.flip()
+        menus.invalidate()
 
     elif game_state == "rest":
         # Rest state before boss battle: let player collect extra health packs
-        draw_rest_screen()
+        menus.show(draw_rest_screen)
+        # Drain the queue, or pending events would keep the idle clock from sleeping.
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
         rest_timer -= dt
         if rest_timer <= 0:
             game_state = "playing"
             # Spawn boss now after rest period
             boss = BossEnemy()
             enemies = []
-            enemy_bullets = []
+            enemy_bullet_pool.release_all()
         # During rest, continue spawning health packs at a higher rate
+        # The rest screen idles, so one dt can cover the whole rest period.
         healthpack_spawn_timer -= dt * 2  # double frequency during rest
-        if healthpack_spawn_timer <= 0:
-            healthpack_spawn_timer = random.uniform(5, 8)
+        while healthpack_spawn_timer <= 0:
+            healthpack_spawn_timer += random.uniform(5, 8)
             healthpacks.append(HealthPack())
-        pygame.display.flip()
 
     elif game_state == "boss_victory":
-        cont_btn, title_btn = draw_boss_victory_screen()
+        cont_btn, title_btn = menus.show(draw_boss_victory_screen)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -732,10 +865,9 @@ while running:
                 elif title_btn.collidepoint(event.pos):
                     game_state = "start"
                     pygame.mixer.music.play(-1)
-        pygame.display.flip()
 
     elif game_state == "game_over":
-        retry_button, title_button = draw_game_over_screen()
+        retry_button, title_button = menus.show(draw_game_over_screen, int(score))
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -746,7 +878,6 @@ while running:
                 elif title_button.collidepoint(event.pos):
                     game_state = "start"
                     pygame.mixer.music.play(-1)
-        pygame.display.flip()
 
 pygame.quit()
 sys.exit()
@@ -0,0 +1,48 @@
+from collections import defaultdict
+
+
+class SpatialHash:
+    """
+    Uniform-grid spatial hash for broad-phase collision checks.
+
+    Objects are bucketed by the cell their centre falls in, under a layer
+    name ("bullets", "enemies", ...), so several kinds of objects can share
+    one grid. A query returns every object of a layer whose centre lies in
+    a cell touched by the square (x - reach, y - reach)..(x + reach, y + reach).
+    Pick reach as the largest distance at which two objects can still
+    collide; the caller then does the exact test on the few candidates.
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+
+    def clear(self):
+        """Empty every bucket (call once per frame before re-inserting)."""
+        self.cells.clear()
+
+    def insert(self, layer, obj, x, y):
+        """Add obj to layer at position (x, y)."""
+        self.cells[(layer, int(x // self.cell_size), int(y // self.cell_size))].append(obj)
+
+    def insert_all(self, layer, objects):
+        """Add every object that has x / y attributes to layer."""
+        cell_size = self.cell_size
+        cells = self.cells
+        for obj in objects:
+            cells[(layer, int(obj.x // cell_size), int(obj.y // cell_size))].append(obj)
+
+    def query(self, layer, x, y, reach):
+        """Return the objects in layer that may lie within reach of (x, y)."""
+        cell_size = self.cell_size
+        cells = self.cells
+        min_cx = int((x - reach) // cell_size)
+        max_cx = int((x + reach) // cell_size)
+        min_cy = int((y - reach) // cell_size)
+        max_cy = int((y + reach) // cell_size)
+        found = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((layer, cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
@@ -1,11 +1,14 @@
 import pygame, sys, random, math
+from text_cache import render_text
+from menu_cache import MenuLayer, IdleClock
 
 # --- Initialize Pygame ---
 pygame.init()
 WIDTH, HEIGHT = 800, 600
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Stickman RPG Fighter")
-clock = pygame.time.Clock()
+clock = IdleClock()
+menus = MenuLayer()
 
 # --- Colors ---
 WHITE   = (255, 255, 255)
@@ -26,16 +29,14 @@ score = 0
 
 # --- Utility Functions ---
 def draw_text(surface, text, size, color, center):
-    font = pygame.font.SysFont("Arial", size)
-    txt_surface = font.render(text, True, color)
+    txt_surface = render_text(text, size, color, "Arial")
     txt_rect = txt_surface.get_rect(center=center)
     surface.blit(txt_surface, txt_rect)
 
 def draw_button(surface, text, rect, button_color, text_color):
     pygame.draw.rect(surface, button_color, rect)
     pygame.draw.rect(surface, WHITE, rect, 2)  # border
-    font = pygame.font.SysFont("Arial", 24)
-    txt_surface = font.render(text, True, text_color)
+    txt_surface = render_text(text, 24, text_color, "Arial")
     txt_rect = txt_surface.get_rect(center=rect.center)
     surface.blit(txt_surface, txt_rect)
 
@@ -222,39 +223,39 @@ def reset_game():
     score = 0
 
 # --- Start Screen ---
-def draw_start_screen():
-    screen.fill(BLACK)
-    draw_text(screen, "Stickman RPG Fighter", 48, WHITE, (WIDTH//2, HEIGHT//3))
+def draw_start_screen(surface):
+    surface.fill(BLACK)
+    draw_text(surface, "Stickman RPG Fighter", 48, WHITE, (WIDTH//2, HEIGHT//3))
     # Start and Exit buttons
     start_rect = pygame.Rect(0, 0, 200, 50)
     start_rect.center = (WIDTH//2, HEIGHT//2)
     exit_rect = pygame.Rect(0, 0, 200, 50)
     exit_rect.center = (WIDTH//2, HEIGHT//2 + 70)
-    draw_button(screen, "Start", start_rect, GRAY, WHITE)
-    draw_button(screen, "Exit", exit_rect, GRAY, WHITE)
+    draw_button(surface, "Start", start_rect, GRAY, WHITE)
+    draw_button(surface, "Exit", exit_rect, GRAY, WHITE)
     return start_rect, exit_rect
 
 # --- Game Over Screen ---
-def draw_game_over_screen():
-    screen.fill(BLACK)
-    draw_text(screen, "Game Over", 48, RED, (WIDTH//2, HEIGHT//3))
-    draw_text(screen, f"Score: {score}", 36, YELLOW, (WIDTH//2, HEIGHT//3 + 50))
+def draw_game_over_screen(surface, final_score):
+    surface.fill(BLACK)
+    draw_text(surface, "Game Over", 48, RED, (WIDTH//2, HEIGHT//3))
+    draw_text(surface, f"Score: {final_score}", 36, YELLOW, (WIDTH//2, HEIGHT//3 + 50))
     # Retry and Title buttons
     retry_rect = pygame.Rect(0, 0, 200, 50)
     retry_rect.center = (WIDTH//2, HEIGHT//2)
     title_rect = pygame.Rect(0, 0, 200, 50)
     title_rect.center = (WIDTH//2, HEIGHT//2 + 70)
-    draw_button(screen, "Retry", retry_rect, GRAY, WHITE)
-    draw_button(screen, "Title", title_rect, GRAY, WHITE)
+    draw_button(surface, "Retry", retry_rect, GRAY, WHITE)
+    draw_button(surface, "Title", title_rect, GRAY, WHITE)
     return retry_rect, title_rect
 
 # --- Main Game Loop ---
 running = True
 while running:
-    dt = clock.tick(60) / 1000.0  # Delta time in seconds
+    dt = clock.tick(60, idle=game_state != "playing") / 1000.0  # Delta time in seconds
 
     if game_state == "start":
-        start_button, exit_button = draw_start_screen()
+        start_button, exit_button = menus.show(draw_start_screen)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -264,7 +265,6 @@ while running:
                     game_state = "playing"
                 elif exit_button.collidepoint(event.pos):
                     running = False
-        pygame.display.flip()
 
     elif game_state == "playing":
         # --- Event Handling ---
@@ -306,9 +306,10 @@ while running:
         pygame.draw.rect(screen, GREEN, (20, 20, int(health_bar_width * health_ratio), health_bar_height))
         draw_text(screen, f"Score: {score}", 24, WHITE, (WIDTH - 100, 30))
         pygame.display.flip()
+        menus.invalidate()
 
     elif game_state == "game_over":
-        retry_button, title_button = draw_game_over_screen()
+        retry_button, title_button = menus.show(draw_game_over_screen, score)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -318,7 +319,6 @@ while running:
                     game_state = "playing"
                 elif title_button.collidepoint(event.pos):
                     game_state = "start"
-        pygame.display.flip()
 
 pygame.quit()
 sys.exit()
@@ -0,0 +1,79 @@
+import os
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """
+    Shared cache for text rendering.
+
+    Font objects are loaded once per (name, size). Rendered text surfaces are
+    kept in an LRU keyed by (name, text, size, color); once max_surfaces is
+    reached the least recently used surface is evicted. `name` may be a
+    system font name (or None for the default font) or a path to a font file.
+    """
+    def __init__(self, max_surfaces=256):
+        self.max_surfaces = max_surfaces
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_font(self, name, size):
+        """Return the font for (name, size), loading it on first use."""
+        font = self.fonts.get((name, size))
+        if font is None:
+            if name is not None and os.path.isfile(name):
+                font = pygame.font.Font(name, size)
+            else:
+                font = pygame.font.SysFont(name, size)
+            self.fonts[(name, size)] = font
+        return font
+
+    def render(self, text, size, color, name="arial"):
+        """Return an antialiased surface for text, rendering it only on a cache miss."""
+        key = (name, text, size, tuple(color))
+        text_surface = self.surfaces.get(key)
+        if text_surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return text_surface
+        self.misses += 1
+        text_surface = self.get_font(name, size).render(text, True, color)
+        self.surfaces[key] = text_surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return text_surface
+
+    def stats(self):
+        """Return hit/miss/eviction counters and current cache sizes."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "fonts": len(self.fonts),
+            "surfaces": len(self.surfaces),
+        }
+
+    def clear(self):
+        self.fonts.clear()
+        self.surfaces.clear()
+
+
+# One cache shared by everything that imports this module.
+text_cache = TextCache()
+
+
+def get_font(name, size):
+    return text_cache.get_font(name, size)
+
+
+def render_text(text, size, color, name="arial"):
+    return text_cache.render(text, size, color, name)
+
+
+def text_cache_stats():
+    return text_cache.stats()
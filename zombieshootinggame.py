@@ -1,4 +1,8 @@
-import pygame, math, random, sys
+import pygame, math, sys
+import numpy as np
+from collections import deque
+from text_cache import render_text
+from menu_cache import MenuLayer, IdleClock
 
 # --- Constants and Settings ---
 SCREEN_WIDTH = 800
@@ -9,6 +13,15 @@ MAX_DEPTH = 800  # maximum distance to cast rays
 TILE_SIZE = 64  # size of one map cell
 # Projection coefficient for wall slice height
 PROJ_COEFF = (SCREEN_WIDTH / 2) / math.tan(HALF_FOV)
+CEILING_COLOR = (100, 100, 100)
+FLOOR_COLOR = (100, 100, 100)
+# Fraction of the screen resolution the 3D view is cast at (1.0 = one ray per
+# pixel column). With ADAPTIVE_RENDER_SCALE the game steps through
+# RENDER_SCALES on its own to hold TARGET_FPS.
+RENDER_SCALE = 1.0
+RENDER_SCALES = (1.0, 0.5, 0.25)
+ADAPTIVE_RENDER_SCALE = True
+TARGET_FPS = 60
 
 # Player settings
 player_x = 100.0
@@ -37,34 +50,122 @@ world_map = [
 ]
 MAP_ROWS = len(world_map)
 MAP_COLS = len(world_map[0])
+# Boolean wall grid used by the vectorized raycaster (indexed [row, col])
+wall_grid = np.array([[cell == '1' for cell in row] for row in world_map], dtype=bool)
 
 # --- Enemy (Zombie Stickman) Setup ---
-# Each enemy is a dict with keys: "x", "y", "health"
-enemies = []
+class EnemyStore:
+    """
+    Struct-of-arrays storage for the zombies: one NumPy array per field, so
+    movement, damage and hit tests run over the whole horde at once.
+    """
+    def __init__(self):
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.health = np.empty(0, dtype=int)
+
+    def __len__(self):
+        return len(self.x)
+
+    @property
+    def alive(self):
+        """Boolean mask of zombies that are still standing."""
+        return self.health > 0
+
+    def reset(self, xs, ys, health):
+        """Replace the whole horde with zombies at (xs, ys), all with the given health."""
+        self.x = np.asarray(xs, dtype=float)
+        self.y = np.asarray(ys, dtype=float)
+        self.health = np.full(len(self.x), health, dtype=int)
+
+enemies = EnemyStore()
 
 def spawn_enemies(num):
     """Spawn a given number of enemies in open spaces away from the player."""
-    global enemies
-    enemies = []
-    for _ in range(num):
-        while True:
-            ex = random.randint(1, MAP_COLS - 2) * TILE_SIZE + TILE_SIZE / 2
-            ey = random.randint(1, MAP_ROWS - 2) * TILE_SIZE + TILE_SIZE / 2
-            cell_x = int(ex // TILE_SIZE)
-            cell_y = int(ey // TILE_SIZE)
-            if world_map[cell_y][cell_x] == '0':
-                # Avoid starting too close to the player
-                if math.hypot(ex - player_x, ey - player_y) > 100:
-                    enemies.append({"x": ex, "y": ey, "health": 3})
-                    break
+    # Centres of every open cell (excluding the border) that is not too close to the player.
+    rows, cols = np.nonzero(~wall_grid[1:-1, 1:-1])
+    centres_x = (cols + 1) * TILE_SIZE + TILE_SIZE / 2
+    centres_y = (rows + 1) * TILE_SIZE + TILE_SIZE / 2
+    far = np.hypot(centres_x - player_x, centres_y - player_y) > 100
+    choice = np.random.randint(0, np.count_nonzero(far), num)
+    enemies.reset(centres_x[far][choice], centres_y[far][choice], 3)
 
 spawn_enemies(5)
 
 # --- Pygame Setup ---
 pygame.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
 pygame.display.set_caption("Zombie FPS – Stickman Attack")
-clock = pygame.time.Clock()
+clock = IdleClock()
+menus = MenuLayer()
+
+# The whole 3D view (ceiling, floor and wall columns) is written into a pixel
+# buffer at render-scale resolution each frame, then stretched to the screen
+# in one pass. Pixels are packed 32-bit values, and grey shades pack as
+# 0x00SSSSSS in any channel order. build_render_buffers() rebuilds these.
+render_scale = RENDER_SCALE
+render_width = render_height = 0
+wall_layer = None
+background_pixels = None
+pixel_rows = None
+column_for_screen_x = None  # cast column that covers each screen column
+# Corrected wall distance for every screen column, filled in by draw_walls()
+# and used to hide zombies standing behind walls.
+depth_buffer = None
+
+# Camera-space lookup tables for the cast columns: each column's angle offset
+# from the view direction and its sin/cos. The fish-eye correction factor is
+# the cosine of the offset. Per frame only a rotation by player_angle is left.
+ray_offsets = None
+ray_offset_sin = None
+ray_offset_cos = None
+fisheye_correction = None
+
+def build_camera_tables():
+    """Rebuild the per-column ray tables for the current render width and FOV."""
+    global ray_offsets, ray_offset_sin, ray_offset_cos, fisheye_correction
+    ray_offsets = -HALF_FOV + (np.arange(render_width) / render_width) * FOV
+    ray_offset_sin = np.sin(ray_offsets)
+    ray_offset_cos = np.cos(ray_offsets)
+    fisheye_correction = ray_offset_cos
+
+def build_render_buffers():
+    """(Re)build every buffer and table that depends on screen size, render scale or FOV."""
+    global render_width, render_height, wall_layer, background_pixels, pixel_rows, column_for_screen_x, depth_buffer
+    render_width = max(1, int(SCREEN_WIDTH * render_scale))
+    render_height = max(1, int(SCREEN_HEIGHT * render_scale))
+    wall_layer = pygame.Surface((render_width, render_height), 0, 32)
+    background_pixels = np.empty((render_width, render_height), dtype=np.uint32)
+    background_pixels[:, :render_height // 2] = wall_layer.map_rgb(CEILING_COLOR)
+    background_pixels[:, render_height // 2:] = wall_layer.map_rgb(FLOOR_COLOR)
+    pixel_rows = np.arange(render_height)
+    column_for_screen_x = np.arange(SCREEN_WIDTH) * render_width // SCREEN_WIDTH
+    depth_buffer = np.full(SCREEN_WIDTH, float(MAX_DEPTH))
+    build_camera_tables()
+
+def set_render_scale(scale):
+    """Switch the 3D view to a new render scale."""
+    global render_scale
+    if scale != render_scale:
+        render_scale = scale
+        build_render_buffers()
+
+def set_view(width, height, fov):
+    """Change screen size and/or field of view at runtime (fov in radians)."""
+    global SCREEN_WIDTH, SCREEN_HEIGHT, FOV, HALF_FOV, PROJ_COEFF
+    SCREEN_WIDTH, SCREEN_HEIGHT = width, height
+    FOV = fov
+    HALF_FOV = FOV / 2
+    PROJ_COEFF = (SCREEN_WIDTH / 2) / math.tan(HALF_FOV)
+    build_render_buffers()
+
+def fit_view():
+    """Follow the window size; pygame 2 resizes the display surface by itself."""
+    size = pygame.display.get_surface().get_size()
+    if size != (SCREEN_WIDTH, SCREEN_HEIGHT):
+        set_view(size[0], size[1], FOV)
+
+build_render_buffers()
 
 # Game states: "start", "playing", "game_over"
 game_state = "start"
@@ -73,70 +174,192 @@ game_state = "start"
 
 def draw_text(surface, text, size, color, center):
     """Draw centered text on a surface."""
-    font = pygame.font.SysFont("Arial", size)
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(text, size, color, "Arial")
     text_rect = text_surface.get_rect(center=center)
     surface.blit(text_surface, text_rect)
 
-def cast_ray(px, py, angle):
+def cast_rays(px, py, angles):
+    """
+    Cast many rays from (px,py) at once using grid traversal (DDA).
+    Returns (distances, sides) arrays: side is 0 when a vertical cell edge
+    (x side) was hit and 1 for a horizontal edge (y side).
+    """
+    angles = np.asarray(angles, dtype=float)
+    return cast_ray_directions(px, py, np.cos(angles), np.sin(angles))
+
+def cast_ray_directions(px, py, cos_a, sin_a):
     """
-    Cast a ray from (px,py) at a given angle.
-    Step along the ray until a wall cell ("1") is hit or MAX_DEPTH is reached.
+    Cast rays from (px,py) along unit direction vectors (cos_a, sin_a).
+    Every ray steps from cell boundary to cell boundary in lockstep, so the
+    loop runs at most MAP_COLS + MAP_ROWS times regardless of the ray count.
     """
-    sin_a = math.sin(angle)
-    cos_a = math.cos(angle)
-    distance = 0
-    step = 1
-    while distance < MAX_DEPTH:
-        test_x = px + cos_a * distance
-        test_y = py + sin_a * distance
-        map_x = int(test_x // TILE_SIZE)
-        map_y = int(test_y // TILE_SIZE)
-        if map_x < 0 or map_x >= MAP_COLS or map_y < 0 or map_y >= MAP_ROWS:
-            return distance
-        if world_map[map_y][map_x] == '1':
-            return distance
-        distance += step
-    return MAX_DEPTH
+    # Avoid dividing by zero for rays that are exactly axis-aligned.
+    cos_a = np.where(cos_a == 0, 1e-12, cos_a)
+    sin_a = np.where(sin_a == 0, 1e-12, sin_a)
+    # Distance along the ray needed to cross one whole cell in x / y.
+    delta_x = np.abs(TILE_SIZE / cos_a)
+    delta_y = np.abs(TILE_SIZE / sin_a)
+    start_x = int(px // TILE_SIZE)
+    start_y = int(py // TILE_SIZE)
+    map_x = np.full(cos_a.shape, start_x)
+    map_y = np.full(cos_a.shape, start_y)
+    step_x = np.where(cos_a < 0, -1, 1)
+    step_y = np.where(sin_a < 0, -1, 1)
+    # Distance along the ray to the first x / y cell boundary.
+    side_x = np.where(cos_a < 0, px - start_x * TILE_SIZE, (start_x + 1) * TILE_SIZE - px) / np.abs(cos_a)
+    side_y = np.where(sin_a < 0, py - start_y * TILE_SIZE, (start_y + 1) * TILE_SIZE - py) / np.abs(sin_a)
+
+    distances = np.full(cos_a.shape, float(MAX_DEPTH))
+    sides = np.zeros(cos_a.shape, dtype=np.int8)
+    # Standing inside a wall (or off the map) means every ray hits immediately.
+    if not (0 <= start_x < MAP_COLS and 0 <= start_y < MAP_ROWS) or wall_grid[start_y, start_x]:
+        distances[:] = 0
+        return distances, sides
+
+    active = np.ones(cos_a.shape, dtype=bool)
+    for _ in range(MAP_COLS + MAP_ROWS):
+        step_in_x = side_x < side_y
+        dist = np.where(step_in_x, side_x, side_y)
+        move_x = active & step_in_x
+        move_y = active & ~step_in_x
+        map_x = np.where(move_x, map_x + step_x, map_x)
+        map_y = np.where(move_y, map_y + step_y, map_y)
+        side_x = np.where(move_x, side_x + delta_x, side_x)
+        side_y = np.where(move_y, side_y + delta_y, side_y)
+        outside = (map_x < 0) | (map_x >= MAP_COLS) | (map_y < 0) | (map_y >= MAP_ROWS)
+        inside_wall = wall_grid[np.clip(map_y, 0, MAP_ROWS - 1), np.clip(map_x, 0, MAP_COLS - 1)]
+        hit = active & (outside | inside_wall)
+        distances[hit] = dist[hit]
+        sides[hit] = np.where(step_in_x[hit], 0, 1)
+        active &= ~hit & (dist < MAX_DEPTH)
+        if not active.any():
+            break
+    np.minimum(distances, MAX_DEPTH, out=distances)
+    return distances, sides
+
+def cast_ray(px, py, angle):
+    """Cast a single ray from (px,py) at a given angle and return the wall distance."""
+    distances, _ = cast_rays(px, py, np.array([angle]))
+    return float(distances[0])
 
 def draw_walls():
-    """Render the 3D walls by casting a ray for each screen column."""
-    for x in range(SCREEN_WIDTH):
-        # Calculate the ray angle for this vertical slice
-        ray_angle = player_angle - HALF_FOV + (x / SCREEN_WIDTH) * FOV
-        distance = cast_ray(player_x, player_y, ray_angle)
-        # Remove fish-eye distortion:
-        distance *= math.cos(player_angle - ray_angle)
-        if distance == 0:
-            distance = 0.0001
-        wall_height = (TILE_SIZE / distance) * PROJ_COEFF
-        # Shading based on distance:
-        shade = 255 / (1 + distance * distance * 0.0001)
-        color = (shade, shade, shade)
-        start_y = int(SCREEN_HEIGHT / 2 - wall_height / 2)
-        end_y = int(SCREEN_HEIGHT / 2 + wall_height / 2)
-        pygame.draw.line(screen, color, (x, start_y), (x, end_y))
-
-def draw_enemy(enemy):
-    """Project and draw a zombie stickman enemy in the 3D view."""
+    """Render the 3D view by casting every column at once and blitting one pixel buffer."""
+    # Rotate the camera-space ray table by the view direction.
+    cos_p = math.cos(player_angle)
+    sin_p = math.sin(player_angle)
+    ray_cos = ray_offset_cos * cos_p - ray_offset_sin * sin_p
+    ray_sin = ray_offset_sin * cos_p + ray_offset_cos * sin_p
+    distances, _ = cast_ray_directions(player_x, player_y, ray_cos, ray_sin)
+    # Remove fish-eye distortion:
+    distances *= fisheye_correction
+    distances[distances == 0] = 0.0001
+    depth_buffer[:] = distances[column_for_screen_x]
+    # Slice heights are worked out in screen pixels and then scaled down.
+    wall_heights = np.minimum((TILE_SIZE / distances) * PROJ_COEFF, SCREEN_HEIGHT * 2) * render_scale
+    # Shading based on distance:
+    shades = (255 / (1 + distances * distances * 0.0001)).astype(np.uint32)
+    start_y = (render_height / 2 - wall_heights / 2).astype(int)
+    end_y = (render_height / 2 + wall_heights / 2).astype(int)
+    # Wall slices over the ceiling/floor background in one vectorized select.
+    in_wall = (pixel_rows >= start_y[:, None]) & (pixel_rows <= end_y[:, None])
+    pixels = np.where(in_wall, (shades * 0x010101)[:, None], background_pixels)
+    pygame.surfarray.blit_array(wall_layer, pixels)
+    if render_scale == 1.0:
+        screen.blit(wall_layer, (0, 0))
+    else:
+        pygame.transform.scale(wall_layer, (SCREEN_WIDTH, SCREEN_HEIGHT), screen)
+
+# Adaptive render scale: smoothed time spent working on each frame (excluding
+# the clock's sleep) and seconds until the scale may change again.
+frame_work_ms = 0.0
+render_scale_cooldown = 0.0
+
+def update_render_scale(dt):
+    """Drop to a lower render scale when frames run over budget, and go back up when there is headroom."""
+    global frame_work_ms, render_scale_cooldown
+    frame_work_ms += (clock.get_rawtime() - frame_work_ms) * 0.1
+    render_scale_cooldown -= dt
+    if not ADAPTIVE_RENDER_SCALE or render_scale_cooldown > 0:
+        return
+    budget_ms = 1000.0 / TARGET_FPS
+    level = RENDER_SCALES.index(render_scale) if render_scale in RENDER_SCALES else 0
+    if frame_work_ms > budget_ms * 0.9 and level < len(RENDER_SCALES) - 1:
+        set_render_scale(RENDER_SCALES[level + 1])
+    elif frame_work_ms < budget_ms * 0.3 and level > 0:
+        set_render_scale(RENDER_SCALES[level - 1])
+    else:
+        return
+    # Give the smoothed frame time a moment to settle at the new scale.
+    render_scale_cooldown = 1.0
+
+def build_depth_max_table():
+    """
+    Sparse table over depth_buffer: row k holds the farthest wall depth in
+    every run of 2**k columns, so the farthest wall behind any column span
+    is two lookups.
+    """
+    table = [depth_buffer]
+    width = 1
+    while width * 2 <= SCREEN_WIDTH:
+        previous = table[-1]
+        table.append(np.maximum(previous[:-width], previous[width:]))
+        width *= 2
+    padded = np.full((len(table), SCREEN_WIDTH), -np.inf)
+    for level, row in enumerate(table):
+        padded[level, :len(row)] = row
+    return padded
+
+def project_enemies():
+    """
+    Project every live zombie into the 3D view once per frame.
+    Zombies outside the field-of-view or completely hidden behind walls are
+    culled. Returns (distance, screen_x, enemy_size, visible_runs) tuples,
+    farthest first, where visible_runs are the (first, last) screen columns
+    in which the zombie is in front of the wall.
+    """
+    alive = enemies.alive
     # Get vector from player to enemy.
-    dx = enemy["x"] - player_x
-    dy = enemy["y"] - player_y
-    distance = math.hypot(dx, dy)
-    # Angle from player to enemy.
-    enemy_angle = math.atan2(dy, dx)
+    dx = enemies.x[alive] - player_x
+    dy = enemies.y[alive] - player_y
+    distance = np.hypot(dx, dy)
     # Relative angle to player's view.
-    delta_angle = enemy_angle - player_angle
-    delta_angle = math.atan2(math.sin(delta_angle), math.cos(delta_angle))
+    delta_angle = np.arctan2(dy, dx) - player_angle
+    delta_angle = np.arctan2(np.sin(delta_angle), np.cos(delta_angle))
     # Only draw if within the field-of-view.
-    if abs(delta_angle) > HALF_FOV:
-        return
-    # Determine screen x-coordinate (projected)
+    in_view = (np.abs(delta_angle) <= HALF_FOV) & (distance > 0)
+    distance = distance[in_view]
+    delta_angle = delta_angle[in_view]
+    # Determine screen x-coordinate (projected); size scales with distance.
     screen_x = (delta_angle / HALF_FOV) * (SCREEN_WIDTH / 2) + (SCREEN_WIDTH / 2)
-    # Size scales with distance.
-    enemy_size = int((TILE_SIZE / distance) * PROJ_COEFF)
-    if enemy_size <= 0:
-        return
+    enemy_size = ((TILE_SIZE / distance) * PROJ_COEFF).astype(int)
+    # Compare against the farthest wall among the columns each stickman covers.
+    arm_span = enemy_size // 4
+    left = np.clip((screen_x - arm_span).astype(int), 0, SCREEN_WIDTH - 1)
+    right = np.clip((screen_x + arm_span).astype(int), 0, SCREEN_WIDTH - 1)
+    depth = distance * np.cos(delta_angle)
+    depth_max = build_depth_max_table()
+    level = np.floor(np.log2(right - left + 1)).astype(int)
+    farthest_wall = np.maximum(depth_max[level, left], depth_max[level, right - (1 << level) + 1])
+    visible = (enemy_size > 0) & (farthest_wall > depth)
+
+    projected = []
+    # Closer zombies are drawn last (on top), reusing the distances above.
+    for i in np.flatnonzero(visible)[np.argsort(-distance[visible])]:
+        in_front = depth_buffer[left[i]:right[i] + 1] > depth[i]
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], in_front, [False])).astype(np.int8)))
+        visible_runs = [(left[i] + start, left[i] + end - 1) for start, end in zip(edges[::2], edges[1::2])]
+        projected.append((distance[i], screen_x[i], int(enemy_size[i]), visible_runs))
+    return projected
+
+def draw_enemy(screen_x, enemy_size, visible_runs):
+    """Draw a projected zombie stickman, clipped to the columns where it is visible."""
+    for first, last in visible_runs:
+        screen.set_clip(pygame.Rect(first, 0, last - first + 1, SCREEN_HEIGHT))
+        draw_stickman(screen_x, enemy_size)
+    screen.set_clip(None)
+
+def draw_stickman(screen_x, enemy_size):
+    """Draw a zombie stickman of the given projected size centred on column screen_x."""
     screen_y = SCREEN_HEIGHT // 2
     # --- Draw Stickman ---
     # Head as a circle.
@@ -160,23 +383,110 @@ def draw_enemy(enemy):
     pygame.draw.line(screen, (0, 255, 0), body_end,
                      (int(screen_x + arm_span), body_end[1] + leg_length), 1)
 
+# --- Zombie Pathfinding (Flow Field) ---
+# One breadth-first search from the player's cell is shared by every zombie.
+# For each open cell, flow_next_x/flow_next_y hold the centre of the
+# neighbouring cell one step closer to the player (NaN where the player
+# cannot be reached), so a zombie's step is a single lookup.
+ZOMBIE_RADIUS = 12
+FLOW_NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+flow_target = None  # player cell (col, row) the field was built for
+flow_next_x = np.full((MAP_ROWS, MAP_COLS), np.nan)
+flow_next_y = np.full((MAP_ROWS, MAP_COLS), np.nan)
+
+def is_open_cell(col, row):
+    """True if (col, row) is on the map and not a wall."""
+    return 0 <= col < MAP_COLS and 0 <= row < MAP_ROWS and not wall_grid[row, col]
+
+def can_step(col, row, dc, dr):
+    """True if a zombie may move from (col, row) to the neighbour (col+dc, row+dr) without cutting a wall corner."""
+    if not is_open_cell(col + dc, row + dr):
+        return False
+    return not (dc and dr) or (is_open_cell(col + dc, row) and is_open_cell(col, row + dr))
+
+def update_flow_field():
+    """Rebuild the shared flow field, but only when the player has entered a new cell."""
+    global flow_target
+    target = (min(max(int(player_x // TILE_SIZE), 0), MAP_COLS - 1),
+              min(max(int(player_y // TILE_SIZE), 0), MAP_ROWS - 1))
+    if target == flow_target:
+        return
+    flow_target = target
+    # Breadth-first search outward from the player's cell.
+    steps = [[-1] * MAP_COLS for _ in range(MAP_ROWS)]
+    steps[target[1]][target[0]] = 0
+    queue = deque([target])
+    while queue:
+        col, row = queue.popleft()
+        for dc, dr in FLOW_NEIGHBOURS[:4]:
+            if is_open_cell(col + dc, row + dr) and steps[row + dr][col + dc] == -1:
+                steps[row + dr][col + dc] = steps[row][col] + 1
+                queue.append((col + dc, row + dr))
+    # Point every reached cell at its best neighbour; diagonals win when they save a step.
+    flow_next_x.fill(np.nan)
+    flow_next_y.fill(np.nan)
+    for row in range(MAP_ROWS):
+        for col in range(MAP_COLS):
+            if steps[row][col] <= 0:
+                continue
+            best = None
+            best_steps = steps[row][col]
+            for dc, dr in FLOW_NEIGHBOURS:
+                if can_step(col, row, dc, dr) and 0 <= steps[row + dr][col + dc] < best_steps:
+                    best = (col + dc, row + dr)
+                    best_steps = steps[row + dr][col + dc]
+            if best is not None:
+                flow_next_x[row, col] = best[0] * TILE_SIZE + TILE_SIZE / 2
+                flow_next_y[row, col] = best[1] * TILE_SIZE + TILE_SIZE / 2
+
+def zombies_fit(xs, ys):
+    """Mask of zombies centred on (xs, ys) that do not overlap any wall cell."""
+    fits = np.ones(len(xs), dtype=bool)
+    for corner_x in (xs - ZOMBIE_RADIUS, xs + ZOMBIE_RADIUS):
+        for corner_y in (ys - ZOMBIE_RADIUS, ys + ZOMBIE_RADIUS):
+            col = (corner_x // TILE_SIZE).astype(int)
+            row = (corner_y // TILE_SIZE).astype(int)
+            on_map = (col >= 0) & (col < MAP_COLS) & (row >= 0) & (row < MAP_ROWS)
+            fits &= on_map & ~wall_grid[np.clip(row, 0, MAP_ROWS - 1), np.clip(col, 0, MAP_COLS - 1)]
+    return fits
+
 def update_enemies(dt):
-    """Move each enemy toward the player and deal damage if too close."""
-    global player_health, score
-    for enemy in enemies:
-        if enemy["health"] > 0:
-            dx = player_x - enemy["x"]
-            dy = player_y - enemy["y"]
-            distance = math.hypot(dx, dy)
-            if distance > 0:
-                move_step = 50 * dt  # enemy speed
-                enemy["x"] += (dx / distance) * move_step
-                enemy["y"] += (dy / distance) * move_step
-            # Attack the player if too near.
-            if distance < 30:
-                player_health -= 20 * dt  # damage per second
-                if player_health < 0:
-                    player_health = 0
+    """Move every enemy along the flow field toward the player and deal damage if too close."""
+    global player_health
+    update_flow_field()
+    alive = np.flatnonzero(enemies.alive)
+    x = enemies.x[alive]
+    y = enemies.y[alive]
+    dx = player_x - x
+    dy = player_y - y
+    distance = np.hypot(dx, dy)
+    # Outside the player's cell, head for the next cell centre on the field.
+    col = (x // TILE_SIZE).astype(int)
+    row = (y // TILE_SIZE).astype(int)
+    on_map = (col >= 0) & (col < MAP_COLS) & (row >= 0) & (row < MAP_ROWS)
+    col = np.clip(col, 0, MAP_COLS - 1)
+    row = np.clip(row, 0, MAP_ROWS - 1)
+    next_x = flow_next_x[row, col]
+    next_y = flow_next_y[row, col]
+    use_field = on_map & ~np.isnan(next_x) & ((col != flow_target[0]) | (row != flow_target[1]))
+    move_x = np.where(use_field, next_x - x, dx)
+    move_y = np.where(use_field, next_y - y, dy)
+    move_length = np.hypot(move_x, move_y)
+    move_length[move_length == 0] = np.inf
+    move_step = 50 * dt  # enemy speed
+    # Move one axis at a time so zombies slide along walls.
+    new_x = x + (move_x / move_length) * move_step
+    x = np.where(zombies_fit(new_x, y), new_x, x)
+    new_y = y + (move_y / move_length) * move_step
+    y = np.where(zombies_fit(x, new_y), new_y, y)
+    enemies.x[alive] = x
+    enemies.y[alive] = y
+    # Every zombie that is too near attacks the player.
+    attackers = np.count_nonzero(distance < 30)
+    if attackers:
+        player_health -= 20 * dt * attackers  # damage per second each
+        if player_health < 0:
+            player_health = 0
 
 def shoot():
     """Handle shooting – reduce ammo and damage the closest enemy in the crosshair."""
@@ -184,26 +494,20 @@ def shoot():
     if player_ammo <= 0:
         return
     player_ammo -= 1
-    hit_enemy = None
-    hit_distance = MAX_DEPTH
-    for enemy in enemies:
-        if enemy["health"] <= 0:
-            continue
-        dx = enemy["x"] - player_x
-        dy = enemy["y"] - player_y
-        distance = math.hypot(dx, dy)
-        enemy_angle = math.atan2(dy, dx)
-        delta_angle = enemy_angle - player_angle
-        delta_angle = math.atan2(math.sin(delta_angle), math.cos(delta_angle))
-        # If the enemy lies within a 5° cone in front.
-        if abs(delta_angle) < math.radians(5):
-            if distance < hit_distance:
-                hit_distance = distance
-                hit_enemy = enemy
-    if hit_enemy:
-        hit_enemy["health"] -= 1
-        if hit_enemy["health"] <= 0:
-            score += 100
+    alive = np.flatnonzero(enemies.alive)
+    dx = enemies.x[alive] - player_x
+    dy = enemies.y[alive] - player_y
+    distance = np.hypot(dx, dy)
+    delta_angle = np.arctan2(dy, dx) - player_angle
+    delta_angle = np.arctan2(np.sin(delta_angle), np.cos(delta_angle))
+    # Enemies within a 5° cone in front, closer than the first wall along the crosshair.
+    in_cone = (np.abs(delta_angle) < math.radians(5)) & (distance < cast_ray(player_x, player_y, player_angle))
+    if not in_cone.any():
+        return
+    hit = alive[in_cone][np.argmin(distance[in_cone])]
+    enemies.health[hit] -= 1
+    if enemies.health[hit] <= 0:
+        score += 100
 
 def reload_gun():
     """Reload the gun (instant reload)."""
@@ -240,28 +544,27 @@ def draw_hud():
     # Score (top center)
     draw_text(screen, f"Score: {score}", 16, (255, 255, 0), (SCREEN_WIDTH // 2, 20 + bar_height//2))
 
-def draw_start_screen():
+def draw_start_screen(surface):
     """Display the start screen."""
-    screen.fill((0, 0, 0))
-    draw_text(screen, "Zombie FPS – Stickman Attack", 36, (255, 255, 255), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-    draw_text(screen, "Press any key to start", 24, (255, 255, 255), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10))
-    pygame.display.flip()
+    surface.fill((0, 0, 0))
+    draw_text(surface, "Zombie FPS – Stickman Attack", 36, (255, 255, 255), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+    draw_text(surface, "Press any key to start", 24, (255, 255, 255), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10))
 
-def draw_game_over():
+def draw_game_over(surface, final_score):
     """Display the game-over screen."""
-    screen.fill((0, 0, 0))
-    draw_text(screen, "Game Over", 48, (255, 0, 0), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-    draw_text(screen, f"Score: {score}", 36, (255, 255, 0), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-    draw_text(screen, "Press R to Restart", 24, (255, 255, 255), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-    pygame.display.flip()
+    surface.fill((0, 0, 0))
+    draw_text(surface, "Game Over", 48, (255, 0, 0), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+    draw_text(surface, f"Score: {final_score}", 36, (255, 255, 0), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+    draw_text(surface, "Press R to Restart", 24, (255, 255, 255), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
 
 # --- Main Game Loop ---
 running = True
 while running:
-    dt = clock.tick(60) / 1000.0
+    dt = clock.tick(60, idle=game_state != "playing") / 1000.0
+    fit_view()
 
     if game_state == "start":
-        draw_start_screen()
+        menus.show(draw_start_screen)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -281,25 +584,26 @@ while running:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
                     reload_gun()
+        # A resize handled while pumping events must not reach the renderer.
+        fit_view()
 
         handle_input(dt)
         update_enemies(dt)
+        update_render_scale(dt)
         if player_health <= 0:
             game_state = "game_over"
 
         # --- Rendering the Scene ---
-        screen.fill((100, 100, 100))
         draw_walls()
-        # Sort enemies by distance so closer ones are drawn last (on top)
-        sorted_enemies = sorted(enemies, key=lambda e: math.hypot(e["x"] - player_x, e["y"] - player_y), reverse=True)
-        for enemy in sorted_enemies:
-            if enemy["health"] > 0:
-                draw_enemy(enemy)
+        # Only zombies in front of the walls are drawn, farthest first.
+        for _, screen_x, enemy_size, visible_runs in project_enemies():
+            draw_enemy(screen_x, enemy_size, visible_runs)
         draw_hud()
         pygame.display.flip()
+        menus.invalidate()
 
     elif game_state == "game_over":
-        draw_game_over()
+        menus.show(draw_game_over, score)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False